@@ -47,6 +47,10 @@ class ShopSystemAdapter(ABC):
     This is an MCP-style interface where each method corresponds to a tool
     that the LLM can call. Implementations fetch data from external systems
     (Tekmetric, Shop-Ware, or mock data for testing).
+
+    Results are sent to the LLM as JSON, so they must contain only JSON-native
+    values (str, int, float, bool, None, lists and dicts): convert datetimes
+    to ISO strings and models to dicts inside the adapter.
     """
 
     # =========================================================================
@@ -92,6 +96,9 @@ class ShopSystemAdapter(ABC):
     # =========================================================================
     # Shop Information Tools
     # =========================================================================
+    # Shop info rarely changes and one adapter instance is shared by every call
+    # to a shop (see get_pooled_adapter), so implementations should cache
+    # these reads themselves, as MockAdapter does with its data files.
 
     @abstractmethod
     async def get_business_hours(self) -> dict[str, Any]:
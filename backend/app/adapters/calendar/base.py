@@ -48,6 +48,9 @@ class CalendarAdapter(ABC):
 
     This interface allows the AI to check availability and create appointments
     across different calendar providers (Google Calendar, Outlook, etc.).
+
+    Like shop system adapters, results must be JSON-native (datetimes as ISO
+    strings) because they are returned to the LLM as tool output.
     """
 
     @abstractmethod
@@ -1,6 +1,8 @@
 """Google Calendar adapter implementation."""
 
+import asyncio
 import logging
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -43,6 +45,9 @@ class GoogleCalendarAdapter(CalendarAdapter):
         self.business_hours_only = business_hours_only
         self._credentials = self._load_credentials(credentials)
         self._service = None
+        # The Google client is blocking and its HTTP connection isn't
+        # thread-safe: requests run in a worker thread, one at a time
+        self._api_lock = asyncio.Lock()
 
     def _load_credentials(self, credentials_dict: dict[str, Any]) -> Credentials:
         """Load OAuth credentials from dictionary.
@@ -80,6 +85,22 @@ class GoogleCalendarAdapter(CalendarAdapter):
             self._service = build("calendar", "v3", credentials=self._credentials)
         return self._service
 
+    async def _execute(self, make_request: Callable[[Any], Any]) -> Any:
+        """Build and execute an API request off the event loop.
+
+        Args:
+            make_request: Builds the request from the Calendar service.
+
+        Returns:
+            The decoded API response.
+        """
+
+        def run() -> Any:
+            return make_request(self._get_service()).execute()
+
+        async with self._api_lock:
+            return await asyncio.to_thread(run)
+
     def get_capabilities(self) -> dict[str, bool]:
         """Get calendar capabilities."""
         return {
@@ -102,19 +123,15 @@ class GoogleCalendarAdapter(CalendarAdapter):
             List of available time slots
         """
         try:
-            service = self._get_service()
-
             # Get existing events in the time range
-            events_result = (
-                service.events()
-                .list(
+            events_result = await self._execute(
+                lambda service: service.events().list(
                     calendarId=self.calendar_id,
                     timeMin=start.isoformat() + "Z",
                     timeMax=end.isoformat() + "Z",
                     singleEvents=True,
                     orderBy="startTime",
                 )
-                .execute()
             )
 
             events = events_result.get("items", [])
@@ -184,8 +201,6 @@ class GoogleCalendarAdapter(CalendarAdapter):
             Result dictionary with success status and appointment ID or error
         """
         try:
-            service = self._get_service()
-
             # Build event
             event = {
                 "summary": appointment.summary,
@@ -203,8 +218,8 @@ class GoogleCalendarAdapter(CalendarAdapter):
                 event["description"] = appointment.description
 
             # Create event
-            created_event = (
-                service.events().insert(calendarId=self.calendar_id, body=event).execute()
+            created_event = await self._execute(
+                lambda service: service.events().insert(calendarId=self.calendar_id, body=event)
             )
 
             return {
@@ -233,18 +248,14 @@ class GoogleCalendarAdapter(CalendarAdapter):
             List of appointments
         """
         try:
-            service = self._get_service()
-
-            events_result = (
-                service.events()
-                .list(
+            events_result = await self._execute(
+                lambda service: service.events().list(
                     calendarId=self.calendar_id,
                     timeMin=start.isoformat() + "Z",
                     timeMax=end.isoformat() + "Z",
                     singleEvents=True,
                     orderBy="startTime",
                 )
-                .execute()
             )
 
             events = events_result.get("items", [])
@@ -34,6 +34,9 @@ class Settings(BaseSettings):
     twilio_phone_number: str = ""
     twilio_webhook_base_url: str = ""  # e.g., "https://your-ngrok-url.ngrok.io"
     default_transfer_number: str = ""  # Fallback if shop has no transfer number
+    # Server VAD speech threshold for phone calls (0-1). Raise it on noisy lines
+    # so line noise doesn't register as the caller speaking and cut the AI off.
+    twilio_vad_threshold: float = 0.5
 
     # Clerk Authentication
     clerk_secret_key: str = ""
@@ -51,6 +54,11 @@ class Settings(BaseSettings):
     google_client_secret: str = ""
     google_redirect_uri: str = ""  # e.g., "https://your-domain.com/api/calendar/google/callback"
 
+    # Concurrent call limits: "memory" (single worker) or "mongo" (shared across workers)
+    call_slot_backend: str = "memory"
+    # Mongo slots are leases: a call whose worker dies stops counting after this long
+    call_slot_lease_seconds: int = 90
+
     # App Settings
     debug: bool = False
     log_level: str = "INFO"
@@ -11,6 +11,7 @@ from app.modules.calls.models import CallLog
 from app.modules.context.models import CustomerContext
 from app.modules.shops.models import ShopConfig
 from app.modules.sms.models import SmsOptOut
+from app.modules.voice.models import ActiveCallCounter
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,7 @@ async def init_db() -> None:
             UsageRecord,  # Usage tracking per period
             CustomerContext,  # Cross-channel customer interaction history
             SmsOptOut,  # SMS opt-out tracking
+            ActiveCallCounter,  # Concurrent call counts shared across workers
         ],
     )
 
@@ -16,10 +16,12 @@ from app.database import close_db, init_db
 from app.modules.billing.router import router as billing_router
 from app.modules.calendar.router import router as calendar_router
 from app.modules.calls.router import router as calls_router
+from app.modules.calls.service import start_call_log_writer, stop_call_log_writer
 from app.modules.context.router import router as context_router
 from app.modules.shops.router import router as shops_router
 from app.modules.sms.router import router as sms_router
 from app.modules.voice.router import router as voice_router
+from app.modules.voice.telephony import drain_background_tasks
 from app.modules.voice.telephony import router as twilio_router
 
 # Configure logging
@@ -36,10 +38,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     logger.info("Starting Akseli Voice Receptionist API...")
     await init_db()
+    start_call_log_writer()
     logger.info("Application started successfully")
     yield
     # Shutdown
     logger.info("Shutting down...")
+    await drain_background_tasks()
+    await stop_call_log_writer()
     await close_db()
 
 
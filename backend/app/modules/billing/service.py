@@ -6,6 +6,7 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import stripe
+from beanie import UpdateResponse
 
 from app.common.utils import utc_now
 from app.config import get_settings
@@ -241,13 +242,24 @@ async def increment_usage(shop_id: str, duration_seconds: int, call_sid: str) ->
     # Calculate minutes (round up to nearest minute, telephony standard)
     minutes = math.ceil(duration_seconds / 60.0) if duration_seconds > 0 else 1
 
-    # Increment usage
-    usage.call_count += 1
-    usage.minutes_used += minutes
-    usage.logged_call_sids.append(call_sid)
-    usage.last_call_at = utc_now()
-    usage.updated_at = utc_now()
-    await usage.save()
+    # Increment usage atomically. Calls for the same shop can end at the same
+    # time, so a read-modify-write save() would lose increments; the call_sid
+    # filter keeps this idempotent across concurrent writers as well.
+    now = utc_now()
+    updated = await UsageRecord.find_one(
+        {"_id": usage.id, "logged_call_sids": {"$ne": call_sid}}
+    ).update(
+        {
+            "$inc": {"call_count": 1, "minutes_used": minutes},
+            "$push": {"logged_call_sids": call_sid},
+            "$set": {"last_call_at": now, "updated_at": now},
+        },
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+    if not isinstance(updated, UsageRecord):
+        logger.debug("Call %s already logged for shop %s, skipping increment", call_sid, shop_id)
+        return usage
+    usage = updated
 
     logger.debug(
         "Usage incremented for shop %s: %d calls, %.2f minutes (call_sid=%s)",
@@ -298,8 +310,8 @@ async def check_concurrent_limit(shop_id: str) -> tuple[bool, int | None, int, i
     if limit is None:  # Unlimited
         return (True, None, 0, 0)
 
-    current_count = get_concurrent_count(shop_id)
-    available = get_available_slots(shop_id, limit)
+    current_count = await get_concurrent_count(shop_id)
+    available = await get_available_slots(shop_id, limit)
     allowed = available is not None and available > 0
 
     return (allowed, available, current_count, limit)
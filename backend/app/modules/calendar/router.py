@@ -14,7 +14,7 @@ os.environ.setdefault("OAUTHLIB_RELAX_TOKEN_SCOPE", "1")
 
 from app.common.auth import AuthenticatedUser, get_current_user
 from app.config import get_settings
-from app.modules.shops.service import get_shop_config_by_owner
+from app.modules.shops.service import clear_shop_phone_cache, get_shop_config_by_owner
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/calendar", tags=["calendar"])
@@ -200,6 +200,7 @@ async def handle_google_callback(
         shop_config.settings.calendar_settings.provider = "google"
 
         await shop_config.save()
+        clear_shop_phone_cache()
 
         return {
             "success": True,
@@ -236,6 +237,7 @@ async def disconnect_google_calendar(
     shop_config.settings.calendar_settings.mode = "read_only"
 
     await shop_config.save()
+    clear_shop_phone_cache()
 
     return {"success": True, "message": "Google Calendar disconnected"}
 
@@ -289,6 +291,7 @@ async def get_google_status(
                             credentials["email"] = fetched_email
                             shop_config.settings.calendar_settings.credentials = credentials
                             await shop_config.save()
+                            clear_shop_phone_cache()
                             email = fetched_email
                             logger.info("Fetched and stored email from Google: %s", email)
                         else:
@@ -1,13 +1,30 @@
 """Business logic for call logging."""
 
+import asyncio
+import logging
 from datetime import UTC, datetime, timedelta
 
 from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
 
 from app.common.exceptions import NotFoundError
 from app.modules.calls.models import CallLog, CallOutcome
 from app.modules.calls.schemas import CallAnalytics, CallLogCreate, DailyCallCount
 
+logger = logging.getLogger(__name__)
+
+# Batched writer for call logs from live calls: flush at this many docs or
+# this many seconds after the first queued doc, whichever comes first
+_CALL_LOG_BATCH_SIZE = 100
+_CALL_LOG_FLUSH_INTERVAL = 0.5
+
+# A failed batch insert is retried this many times (only the failed docs)
+_CALL_LOG_INSERT_RETRIES = 1
+_CALL_LOG_RETRY_DELAY = 1.0
+
+_call_log_queue: asyncio.Queue[CallLog | None] | None = None
+_call_log_writer: asyncio.Task[None] | None = None
+
 
 async def get_call_logs(shop_id: str | None = None, limit: int = 100) -> list[CallLog]:
     """Get call logs with optional filters."""
@@ -31,6 +48,133 @@ async def create_call_log(call_data: CallLogCreate) -> CallLog:
     return call_log
 
 
+async def save_call_log(call_log: CallLog) -> None:
+    """Persist a call log from a live call.
+
+    Queues the log for the batched writer when it is running; otherwise
+    (tests, scripts) inserts it directly. A writer that has died is restarted
+    first so queued logs don't pile up unwritten.
+
+    Args:
+        call_log: The call log to save.
+    """
+    if _call_log_writer is not None and _call_log_writer.done():
+        _restart_call_log_writer(_call_log_writer)
+    if _call_log_queue is not None:
+        _call_log_queue.put_nowait(call_log)
+    else:
+        await call_log.insert()
+
+
+async def _insert_call_logs(batch: list[CallLog]) -> None:
+    """Insert a batch of call logs, tolerating duplicates.
+
+    Failed inserts are retried up to _CALL_LOG_INSERT_RETRIES times. After a
+    bulk write error only the documents that failed for a reason other than
+    a duplicate call_sid are retried; after any other error (e.g. a dropped
+    connection) the whole batch is, since duplicates are tolerated. Logs still
+    failing after the retries are dropped with an error.
+    """
+    pending = batch
+    for attempt in range(_CALL_LOG_INSERT_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(_CALL_LOG_RETRY_DELAY)
+        try:
+            await CallLog.insert_many(pending, ordered=False)
+            return
+        except BulkWriteError as e:
+            # Duplicate call_sid (unique index) means the call is already logged
+            errors = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+            if not errors:
+                return
+            pending = [pending[err["index"]] for err in errors]
+            logger.warning(
+                "Failed to insert %d of %d call logs: %s", len(errors), len(batch), errors
+            )
+        except Exception as e:
+            logger.warning("Failed to insert %d call logs: %s", len(pending), e)
+
+    logger.error(
+        "Dropping %d call logs after %d attempts: %s",
+        len(pending),
+        _CALL_LOG_INSERT_RETRIES + 1,
+        [log.call_sid for log in pending],
+    )
+
+
+async def _run_call_log_writer(queue: asyncio.Queue[CallLog | None]) -> None:
+    """Drain queued call logs into insert_many batches until None is queued."""
+    loop = asyncio.get_running_loop()
+    while True:
+        first = await queue.get()
+        if first is None:
+            return
+
+        batch = [first]
+        stopping = False
+        deadline = loop.time() + _CALL_LOG_FLUSH_INTERVAL
+        while len(batch) < _CALL_LOG_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+
+        await _insert_call_logs(batch)
+        if stopping:
+            return
+
+
+def start_call_log_writer() -> None:
+    """Start the batched call log writer (called on application startup)."""
+    global _call_log_queue, _call_log_writer
+
+    if _call_log_writer is not None:
+        return
+    _call_log_queue = asyncio.Queue()
+    _call_log_writer = asyncio.create_task(_run_call_log_writer(_call_log_queue))
+
+
+def _restart_call_log_writer(dead: asyncio.Task[None]) -> None:
+    """Replace a writer that stopped unexpectedly, keeping its queued logs."""
+    global _call_log_queue, _call_log_writer
+
+    error = None if dead.cancelled() else dead.exception()
+    logger.error("Call log writer stopped unexpectedly, restarting: %r", error)
+
+    # Carry over whatever the dead writer left behind onto a fresh queue
+    queue: asyncio.Queue[CallLog | None] = asyncio.Queue()
+    if _call_log_queue is not None:
+        while not _call_log_queue.empty():
+            item = _call_log_queue.get_nowait()
+            if item is not None:
+                queue.put_nowait(item)
+    _call_log_queue = queue
+    _call_log_writer = asyncio.create_task(_run_call_log_writer(queue))
+
+
+async def stop_call_log_writer() -> None:
+    """Flush queued call logs and stop the writer (called on shutdown)."""
+    global _call_log_queue, _call_log_writer
+
+    if _call_log_writer is None or _call_log_queue is None:
+        return
+
+    # New saves insert directly from here on; the writer drains what's queued
+    queue, writer = _call_log_queue, _call_log_writer
+    _call_log_queue = None
+    _call_log_writer = None
+
+    queue.put_nowait(None)
+    await writer
+
+
 async def get_call_analytics(shop_id: str, days: int = 30) -> CallAnalytics:
     """Get aggregated call analytics for a shop.
 
@@ -42,8 +42,7 @@ async def create_my_shop(
     Each user can only have one shop (MVP limitation).
     """
     # Check if user already has a shop
-    existing = await service.get_shop_config_by_owner(user.user_id)
-    if existing:
+    if await service.shop_exists_for_owner(user.user_id):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="You already have a shop. Use PATCH /api/shops/me to update it.",
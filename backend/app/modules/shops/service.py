@@ -1,12 +1,24 @@
 """Business logic for shop configuration management."""
 
-from beanie import PydanticObjectId
+import time
+from collections import OrderedDict
+from typing import Any
+
+from beanie import PydanticObjectId, UpdateResponse
+from bson.errors import InvalidId
 
 from app.common.exceptions import NotFoundError
-from app.common.utils import utc_now
 from app.modules.shops.models import AdapterCredentials, ShopConfig, ShopSettings
 from app.modules.shops.schemas import ShopConfigCreate, ShopConfigUpdate
 
+# Call routing cache: normalized phone -> (fetched_at, config), least recently
+# used first. Numbers map to shops at human timescales, so repeat calls skip up
+# to three queries during setup. Keys come from an unauthenticated webhook and
+# misses are cached too, so the cache is bounded.
+_SHOP_BY_PHONE_TTL = 60
+_SHOP_BY_PHONE_MAXSIZE = 1024
+_shop_by_phone_cache: OrderedDict[str, tuple[float, ShopConfig | None]] = OrderedDict()
+
 
 def get_allowed_intents(shop_config: ShopConfig | None) -> list[str]:
     """Get allowed intents based on shop configuration.
@@ -36,18 +48,33 @@ def get_allowed_intents(shop_config: ShopConfig | None) -> list[str]:
     return base_intents
 
 
-async def get_all_shop_configs() -> list[ShopConfig]:
-    """Get all shop configurations.
+async def get_all_shop_configs(skip: int = 0, limit: int = 100) -> list[ShopConfig]:
+    """Get shop configurations, one page at a time.
 
     Note: This is an admin-only function. Regular users should use
     get_shop_config_by_owner instead.
+
+    Args:
+        skip: Number of shops to skip.
+        limit: Maximum number of shops to return.
+
+    Returns:
+        A page of shop configurations.
     """
-    return await ShopConfig.find_all().to_list()
+    return await ShopConfig.find_all().skip(skip).limit(limit).to_list()
+
+
+def _parse_shop_id(shop_id: str) -> PydanticObjectId:
+    """Convert a shop ID from a request, treating malformed IDs as not found."""
+    try:
+        return PydanticObjectId(shop_id)
+    except InvalidId:
+        raise NotFoundError("ShopConfig", shop_id) from None
 
 
 async def get_shop_config_by_id(shop_id: str) -> ShopConfig:
     """Get a shop configuration by ID."""
-    config = await ShopConfig.get(PydanticObjectId(shop_id))
+    config = await ShopConfig.get(_parse_shop_id(shop_id))
     if not config:
         raise NotFoundError("ShopConfig", shop_id)
     return config
@@ -65,6 +92,21 @@ async def get_shop_config_by_owner(owner_id: str) -> ShopConfig | None:
     return await ShopConfig.find_one(ShopConfig.owner_id == owner_id)
 
 
+async def shop_exists_for_owner(owner_id: str) -> bool:
+    """Check whether an owner already has a shop, without loading it.
+
+    Counting against the owner_id index avoids fetching and decoding the
+    full shop document (credentials, settings) just to test existence.
+
+    Args:
+        owner_id: The Clerk user ID of the shop owner.
+
+    Returns:
+        True if the owner has a shop.
+    """
+    return await ShopConfig.find(ShopConfig.owner_id == owner_id).count() > 0
+
+
 def normalize_phone(phone: str) -> str:
     """Normalize phone number to E.164 format (+1XXXXXXXXXX for US/CA).
 
@@ -116,6 +158,42 @@ async def get_shop_config_by_phone(phone: str) -> ShopConfig | None:
     return shop
 
 
+async def get_shop_config_by_phone_cached(phone: str) -> ShopConfig | None:
+    """Get a shop configuration by phone number, cached for call routing.
+
+    Results (including misses) are reused for _SHOP_BY_PHONE_TTL seconds,
+    keeping at most _SHOP_BY_PHONE_MAXSIZE numbers. Shop writes call
+    clear_shop_phone_cache(), which only clears this worker's cache: under
+    several workers the others may keep routing with the old shop for up to
+    _SHOP_BY_PHONE_TTL seconds.
+
+    Args:
+        phone: The called phone number, in any format.
+
+    Returns:
+        The shop config if found, None otherwise.
+    """
+    key = normalize_phone(phone)
+    now = time.monotonic()
+    cached = _shop_by_phone_cache.get(key)
+    if cached is not None:
+        if (now - cached[0]) <= _SHOP_BY_PHONE_TTL:
+            _shop_by_phone_cache.move_to_end(key)
+            return cached[1]
+        del _shop_by_phone_cache[key]
+
+    shop = await get_shop_config_by_phone(key)
+    _shop_by_phone_cache[key] = (now, shop)
+    if len(_shop_by_phone_cache) > _SHOP_BY_PHONE_MAXSIZE:
+        _shop_by_phone_cache.popitem(last=False)
+    return shop
+
+
+def clear_shop_phone_cache() -> None:
+    """Drop this worker's cached phone lookups after a shop write."""
+    _shop_by_phone_cache.clear()
+
+
 async def create_shop_config(data: ShopConfigCreate, owner_id: str) -> ShopConfig:
     """Create a new shop configuration.
 
@@ -135,22 +213,55 @@ async def create_shop_config(data: ShopConfigCreate, owner_id: str) -> ShopConfi
         settings=data.settings or ShopSettings(),
     )
     await config.insert()
+    clear_shop_phone_cache()
     return config
 
 
+async def _apply_shop_update(
+    shop_id: PydanticObjectId | None, update_data: dict[str, Any]
+) -> ShopConfig | None:
+    """Apply a $set to a shop and return the updated document in one round trip.
+
+    updated_at is stamped by the server with $currentDate, so every worker
+    agrees on the clock regardless of local skew.
+
+    Args:
+        shop_id: The shop's document ID.
+        update_data: Fields to set.
+
+    Returns:
+        The shop config after the update, or None if it no longer exists.
+    """
+    return await ShopConfig.find_one({"_id": shop_id}).update(
+        {"$set": update_data, "$currentDate": {"updated_at": True}},
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+
+
 async def update_shop_config(shop_id: str, data: ShopConfigUpdate) -> ShopConfig:
-    """Update a shop configuration."""
-    config = await get_shop_config_by_id(shop_id)
+    """Update a shop configuration.
 
+    Args:
+        shop_id: The shop's document ID.
+        data: The update data.
+
+    Returns:
+        The updated shop configuration.
+
+    Raises:
+        NotFoundError: If the ID is malformed or no such shop exists.
+    """
+    shop_oid = _parse_shop_id(shop_id)
     update_data = data.model_dump(exclude_unset=True)
-    update_data["updated_at"] = utc_now()
 
     # Normalize phone if being updated
     if "phone" in update_data and update_data["phone"]:
         update_data["phone"] = normalize_phone(update_data["phone"])
 
-    await config.update({"$set": update_data})
-    await config.sync()
+    config = await _apply_shop_update(shop_oid, update_data)
+    if not config:
+        raise NotFoundError("ShopConfig", shop_id)
+    clear_shop_phone_cache()
 
     return config
 
@@ -173,7 +284,6 @@ async def update_shop_config_by_owner(owner_id: str, data: ShopConfigUpdate) ->
         raise NotFoundError("ShopConfig", f"owner:{owner_id}")
 
     update_data = data.model_dump(exclude_unset=True)
-    update_data["updated_at"] = utc_now()
 
     # Normalize phone if being updated
     if "phone" in update_data and update_data["phone"]:
@@ -192,16 +302,19 @@ async def update_shop_config_by_owner(owner_id: str, data: ShopConfigUpdate) ->
                         existing_credentials
                     )
 
-    await config.update({"$set": update_data})
-    await config.sync()
+    updated = await _apply_shop_update(config.id, update_data)
+    if not updated:
+        raise NotFoundError("ShopConfig", f"owner:{owner_id}")
+    clear_shop_phone_cache()
 
-    return config
+    return updated
 
 
 async def delete_shop_config(shop_id: str) -> None:
     """Delete a shop configuration."""
     config = await get_shop_config_by_id(shop_id)
     await config.delete()
+    clear_shop_phone_cache()
 
 
 async def delete_shop_config_by_owner(owner_id: str) -> None:
@@ -217,3 +330,4 @@ async def delete_shop_config_by_owner(owner_id: str) -> None:
     if not config:
         raise NotFoundError("ShopConfig", f"owner:{owner_id}")
     await config.delete()
+    clear_shop_phone_cache()
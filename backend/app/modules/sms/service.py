@@ -1,6 +1,8 @@
 """SMS service for sending call summaries to customers."""
 
+import asyncio
 import logging
+from functools import lru_cache
 from typing import Any
 
 from twilio.rest import Client  # type: ignore[import-untyped]
@@ -15,17 +17,29 @@ logger = logging.getLogger(__name__)
 _settings = get_settings()
 
 
+@lru_cache
+def get_twilio_client() -> Client | None:
+    """Get the shared Twilio REST client (one per process).
+
+    Reusing one client keeps its HTTP session, so SMS sends and call
+    transfers ride on pooled keep-alive connections instead of a new TLS
+    handshake each time.
+
+    Returns:
+        The Twilio client, or None if credentials are not configured.
+    """
+    if _settings.twilio_account_sid and _settings.twilio_auth_token:
+        return Client(_settings.twilio_account_sid, _settings.twilio_auth_token)
+    return None
+
+
 class SmsService:
     """Service for sending SMS messages via Twilio."""
 
     def __init__(self) -> None:
         """Initialize Twilio client."""
-        if _settings.twilio_account_sid and _settings.twilio_auth_token:
-            self.client: Client | None = Client(
-                _settings.twilio_account_sid, _settings.twilio_auth_token
-            )
-        else:
-            self.client = None
+        self.client = get_twilio_client()
+        if self.client is None:
             logger.warning("Twilio credentials not configured, SMS will be disabled")
 
     async def is_opted_out(self, phone_number: str, shop_id: str) -> bool:
@@ -327,7 +341,9 @@ class SmsService:
                 return False
 
             # Send SMS
-            twilio_message = self.client.messages.create(
+            # Off the event loop: the Twilio SDK blocks on the HTTPS request
+            twilio_message = await asyncio.to_thread(
+                self.client.messages.create,
                 body=message,
                 from_=from_num,
                 to=normalized_to,
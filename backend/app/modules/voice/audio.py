@@ -0,0 +1,39 @@
+"""Audio format helpers for the voice pipeline.
+
+Twilio calls stay in g711_ulaw end to end, so nothing here is on the call
+path today. These helpers are for consumers that need linear PCM (e.g. a
+local VAD or level meter) and are written to avoid per-sample Python loops.
+"""
+
+
+def _ulaw_to_linear(code: int) -> int:
+    """Decode one G.711 mu-law byte to a signed 16-bit sample."""
+    code = ~code & 0xFF
+    exponent = (code >> 4) & 0x07
+    mantissa = code & 0x0F
+    sample = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return -sample if code & 0x80 else sample
+
+
+# Lookup tables mapping each mu-law byte to the low and high byte of its
+# little-endian int16 sample, for use with bytes.translate
+_ULAW_TO_PCM_LO = bytes(_ulaw_to_linear(code) & 0xFF for code in range(256))
+_ULAW_TO_PCM_HI = bytes((_ulaw_to_linear(code) >> 8) & 0xFF for code in range(256))
+
+
+def ulaw_to_pcm16(audio: bytes) -> bytes:
+    """Convert g711_ulaw audio to 16-bit little-endian PCM.
+
+    Both table lookups and the interleave run in C (bytes.translate and
+    extended slice assignment), so cost is linear with no Python per sample.
+
+    Args:
+        audio: Mu-law encoded audio, one byte per sample.
+
+    Returns:
+        PCM audio, two bytes per sample, at the same sample rate.
+    """
+    pcm = bytearray(len(audio) * 2)
+    pcm[0::2] = audio.translate(_ULAW_TO_PCM_LO)
+    pcm[1::2] = audio.translate(_ULAW_TO_PCM_HI)
+    return bytes(pcm)
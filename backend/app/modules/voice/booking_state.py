@@ -4,10 +4,12 @@ This module tracks proposed appointments per session to ensure explicit
 customer confirmation before any write operations.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+from app.common.utils import utc_now
+
 
 @dataclass
 class BookingState:
@@ -32,8 +34,6 @@ class BookingState:
             time: ISO time string (e.g., "15:00:00")
             duration_minutes: Duration of the appointment
         """
-        from app.common.utils import utc_now
-
         self.proposed_date = date
         self.proposed_time = time
         self.proposed_duration_minutes = duration_minutes
@@ -96,3 +96,30 @@ class BookingState:
             "timestamp": self.timestamp.isoformat() if self.timestamp else None,
             "confirmed": self.confirmed,
         }
+
+
+@dataclass(slots=True)
+class BookingAttempt:
+    """One booking tool call (check, propose or confirm) and how it ended.
+
+    Collected per call and saved in the call log metadata so failed
+    bookings can be reviewed.
+    """
+
+    tool_name: str
+    timestamp: str = field(default_factory=lambda: utc_now().isoformat())
+    slot_proposed: str | None = None
+    confirmation_received: bool = False
+    write_success: bool = False
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging."""
+        return {
+            "tool_name": self.tool_name,
+            "timestamp": self.timestamp,
+            "slot_proposed": self.slot_proposed,
+            "confirmation_received": self.confirmation_received,
+            "write_success": self.write_success,
+            "error": self.error,
+        }
@@ -1,4 +1,9 @@
-"""Call queue manager using asyncio.Queue for managing queued calls."""
+"""Call queue manager using asyncio.Queue for managing queued calls.
+
+Queues are per process. Under several workers a held call's polls can land on
+any of them, so the queue handler admits calls through the shared call slot
+backend, not through queue membership.
+"""
 
 import asyncio
 import logging
@@ -1,83 +1,240 @@
-"""Concurrent call manager using asyncio.Semaphore for per-shop call limits."""
+"""Concurrent call manager for per-shop call limits.
+
+Active call counts live in a pluggable backend:
+- "memory" (default): asyncio.Semaphore per shop, correct for a single worker.
+- "mongo": per-call leases in MongoDB, shared by every worker process so the
+  limits still hold under `uvicorn --workers N`. Leases are renewed while a
+  call is live, so slots held by a worker that dies mid-call expire.
+"""
 
 import asyncio
 import logging
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from functools import lru_cache
+
+from pymongo.errors import DuplicateKeyError
+
+from app.common.utils import utc_now
+from app.config import get_settings
+from app.modules.voice.models import ActiveCallCounter
 
 logger = logging.getLogger(__name__)
 
-# Global dictionary to store semaphores per shop
-_semaphores: dict[str, asyncio.Semaphore] = {}
-_semaphore_locks: dict[str, asyncio.Lock] = {}
-_call_counts: dict[str, int] = {}  # Track actual call count for metrics
+# Number of lock stripes guarding call admission (must be a power of two)
+_LOCK_STRIPES = 32
 
 
-def _get_semaphore_lock(shop_id: str) -> asyncio.Lock:
-    """Get or create a lock for managing semaphore creation."""
-    if shop_id not in _semaphore_locks:
-        _semaphore_locks[shop_id] = asyncio.Lock()
-    return _semaphore_locks[shop_id]
+class CallSlotBackend(ABC):
+    """Storage for per-shop active call counts."""
 
+    @abstractmethod
+    async def acquire(self, shop_id: str, limit: int, call_id: str) -> bool:
+        """Take a slot for `call_id` if fewer than `limit` calls are active."""
+        ...
 
-def get_semaphore(shop_id: str, limit: int) -> asyncio.Semaphore:
-    """Get or create a semaphore for a shop.
+    @abstractmethod
+    async def release(self, shop_id: str, call_id: str) -> None:
+        """Give back the slot taken by acquire() for `call_id`."""
+        ...
 
-    Args:
-        shop_id: The shop's ID.
-        limit: Maximum concurrent calls allowed.
+    async def renew(self, shop_id: str, call_id: str) -> None:
+        """Keep the slot for a live call from expiring (no-op by default)."""
+        return None
 
-    Returns:
-        The semaphore for this shop.
+    @abstractmethod
+    async def count(self, shop_id: str) -> int:
+        """Get the number of active calls for a shop."""
+        ...
+
+
+class InMemoryCallSlotBackend(CallSlotBackend):
+    """Per-process call slots backed by asyncio semaphores."""
+
+    def __init__(self) -> None:
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._call_counts: dict[str, int] = {}  # Track actual call count for metrics
+
+        # Striped admission locks: shops hashing to different stripes never
+        # contend, and the lock table stays a fixed size no matter how many
+        # shops we serve. Only admission takes them; count() reads the dict
+        # directly so monitoring never waits on call setup.
+        self._locks: list[asyncio.Lock] = [asyncio.Lock() for _ in range(_LOCK_STRIPES)]
+
+    def _lock_for(self, shop_id: str) -> asyncio.Lock:
+        """Get the admission lock stripe for a shop."""
+        return self._locks[hash(shop_id) & (_LOCK_STRIPES - 1)]
+
+    def get_semaphore(self, shop_id: str, limit: int) -> asyncio.Semaphore:
+        """Get or create a semaphore for a shop.
+
+        Args:
+            shop_id: The shop's ID.
+            limit: Maximum concurrent calls allowed.
+
+        Returns:
+            The semaphore for this shop.
+        """
+        if shop_id not in self._semaphores:
+            # Create semaphore with the limit
+            self._semaphores[shop_id] = asyncio.Semaphore(limit)
+            self._call_counts[shop_id] = 0
+            logger.debug("Created semaphore for shop %s with limit %d", shop_id, limit)
+        return self._semaphores[shop_id]
+
+    async def acquire(self, shop_id: str, limit: int, call_id: str) -> bool:
+        async with self._lock_for(shop_id):
+            semaphore = self.get_semaphore(shop_id, limit)
+
+            # Non-blocking acquire: the stripe lock makes check-then-acquire atomic
+            if semaphore.locked():
+                return False
+
+            await semaphore.acquire()
+            self._call_counts[shop_id] = self._call_counts.get(shop_id, 0) + 1
+            return True
+
+    async def release(self, shop_id: str, call_id: str) -> None:
+        if shop_id in self._semaphores:
+            self._semaphores[shop_id].release()
+            self._call_counts[shop_id] = max(0, self._call_counts.get(shop_id, 1) - 1)
+
+    async def count(self, shop_id: str) -> int:
+        return self._call_counts.get(shop_id, 0)
+
+
+class MongoCallSlotBackend(CallSlotBackend):
+    """Call slots shared across worker processes via MongoDB leases.
+
+    Each shop has one document holding a lease per active call. Admission is a
+    single conditional upsert: a lease is pushed only while the array has
+    fewer than `limit` entries. At the limit the filter matches nothing, the
+    upsert collides with the unique shop_id index, and the call is refused.
+
+    Leases carry an expiry that the call's worker renews (see
+    keep_call_slot_alive). If the worker dies, release() never runs, so
+    expired leases are pulled before each admission and ignored by count().
     """
-    if shop_id not in _semaphores:
-        # Create semaphore with the limit
-        _semaphores[shop_id] = asyncio.Semaphore(limit)
-        _call_counts[shop_id] = 0
-        logger.debug("Created semaphore for shop %s with limit %d", shop_id, limit)
-    return _semaphores[shop_id]
+
+    def __init__(self, lease_seconds: int) -> None:
+        self._lease = timedelta(seconds=lease_seconds)
+
+    async def acquire(self, shop_id: str, limit: int, call_id: str) -> bool:
+        now = utc_now()
+        await ActiveCallCounter.find_one({"shop_id": shop_id}).update(
+            {"$pull": {"leases": {"expires_at": {"$lte": now}}}}
+        )
+
+        lease = {"call_id": call_id, "expires_at": now + self._lease}
+        # The array-size filter isn't an equality match, so MongoDB won't retry
+        # an upsert that races another worker creating the shop's document.
+        # One retry tells that race apart from a shop that is really full.
+        for _ in range(2):
+            try:
+                await ActiveCallCounter.find_one(
+                    {"shop_id": shop_id, f"leases.{limit - 1}": {"$exists": False}}
+                ).update(
+                    {"$push": {"leases": lease}, "$set": {"updated_at": now}},
+                    upsert=True,
+                )
+            except DuplicateKeyError:
+                continue
+            return True
+        return False
+
+    async def release(self, shop_id: str, call_id: str) -> None:
+        await ActiveCallCounter.find_one({"shop_id": shop_id}).update(
+            {"$pull": {"leases": {"call_id": call_id}}, "$set": {"updated_at": utc_now()}}
+        )
+
+    async def renew(self, shop_id: str, call_id: str) -> None:
+        now = utc_now()
+        await ActiveCallCounter.find_one({"shop_id": shop_id, "leases.call_id": call_id}).update(
+            {"$set": {"leases.$.expires_at": now + self._lease, "updated_at": now}}
+        )
+
+    async def count(self, shop_id: str) -> int:
+        # Count unexpired leases server-side (stored dates come back naive)
+        result = (
+            await ActiveCallCounter.find({"shop_id": shop_id})
+            .aggregate(
+                [
+                    {
+                        "$project": {
+                            "active": {
+                                "$size": {
+                                    "$filter": {
+                                        "input": {"$ifNull": ["$leases", []]},
+                                        "cond": {"$gt": ["$$this.expires_at", utc_now()]},
+                                    }
+                                }
+                            }
+                        }
+                    }
+                ]
+            )
+            .to_list()
+        )
+        return result[0]["active"] if result else 0
 
 
-async def acquire_call_slot(shop_id: str, limit: int) -> bool:
+@lru_cache
+def get_call_slot_backend() -> CallSlotBackend:
+    """Get the configured call slot backend (one per process)."""
+    settings = get_settings()
+    if settings.call_slot_backend == "mongo":
+        return MongoCallSlotBackend(settings.call_slot_lease_seconds)
+    return InMemoryCallSlotBackend()
+
+
+async def acquire_call_slot(shop_id: str, limit: int, call_id: str) -> bool:
     """Try to acquire a call slot (non-blocking).
 
     Args:
         shop_id: The shop's ID.
         limit: Maximum concurrent calls allowed.
+        call_id: The Twilio CallSid the slot is held for.
 
     Returns:
         True if slot was acquired, False if limit reached.
     """
-    if limit is None:  # Unlimited
-        _call_counts[shop_id] = _call_counts.get(shop_id, 0) + 1
+    if await get_call_slot_backend().acquire(shop_id, limit, call_id):
+        logger.debug("Acquired call slot for shop %s (limit %d)", shop_id, limit)
         return True
 
-    semaphore = get_semaphore(shop_id, limit)
-
-    # Try to acquire without blocking using zero timeout
-    try:
-        await asyncio.wait_for(semaphore.acquire(), timeout=0.0)
-        _call_counts[shop_id] = _call_counts.get(shop_id, 0) + 1
-        logger.debug(
-            "Acquired call slot for shop %s (%d/%d)", shop_id, _call_counts[shop_id], limit
-        )
-        return True
-    except TimeoutError:
-        logger.debug("Call slot limit reached for shop %s (%d/%d)", shop_id, limit, limit)
-        return False
+    logger.debug("Call slot limit reached for shop %s (%d/%d)", shop_id, limit, limit)
+    return False
 
 
-def release_call_slot(shop_id: str) -> None:
+async def release_call_slot(shop_id: str, call_id: str) -> None:
     """Release a call slot when a call ends.
 
     Args:
         shop_id: The shop's ID.
+        call_id: The Twilio CallSid the slot was acquired for.
+    """
+    await get_call_slot_backend().release(shop_id, call_id)
+    logger.debug("Released call slot for shop %s", shop_id)
+
+
+async def keep_call_slot_alive(shop_id: str, call_id: str) -> None:
+    """Renew a call's slot lease until cancelled when the call ends.
+
+    Args:
+        shop_id: The shop's ID.
+        call_id: The Twilio CallSid holding the slot.
     """
-    if shop_id in _semaphores:
-        _semaphores[shop_id].release()
-        _call_counts[shop_id] = max(0, _call_counts.get(shop_id, 1) - 1)
-        logger.debug("Released call slot for shop %s (%d active)", shop_id, _call_counts[shop_id])
+    backend = get_call_slot_backend()
+    interval = get_settings().call_slot_lease_seconds / 3
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await backend.renew(shop_id, call_id)
+        except Exception as e:
+            logger.warning("Failed to renew call slot for shop %s: %s", shop_id, e)
 
 
-def get_available_slots(shop_id: str, limit: int | None) -> int | None:
+async def get_available_slots(shop_id: str, limit: int | None) -> int | None:
     """Get the number of available call slots.
 
     Args:
@@ -90,12 +247,12 @@ def get_available_slots(shop_id: str, limit: int | None) -> int | None:
     if limit is None:
         return None
 
-    current_count = _call_counts.get(shop_id, 0)
+    current_count = await get_concurrent_count(shop_id)
     available = max(0, limit - current_count)
     return available
 
 
-def get_concurrent_count(shop_id: str) -> int:
+async def get_concurrent_count(shop_id: str) -> int:
     """Get the current number of concurrent calls for a shop.
 
     Args:
@@ -104,4 +261,4 @@ def get_concurrent_count(shop_id: str) -> int:
     Returns:
         Current number of active calls.
     """
-    return _call_counts.get(shop_id, 0)
+    return await get_call_slot_backend().count(shop_id)
@@ -7,7 +7,9 @@ This module will contain:
 - Tool-to-intent mapping for analytics and logging
 """
 
+from collections.abc import Mapping
 from enum import Enum
+from types import MappingProxyType
 
 from app.modules.calls.models import CallIntent
 
@@ -26,22 +28,25 @@ class Intent(str, Enum):
 
 # Centralized tool-to-intent mapping for analytics and logging
 # This is the single source of truth for mapping tool names to CallIntent values
-TOOL_TO_INTENT_MAPPING: dict[str, CallIntent] = {
-    # Status/introspection tools
-    "lookup_work_order": CallIntent.CHECK_STATUS,
-    "get_work_order_status": CallIntent.CHECK_STATUS,
-    "get_customer_vehicles": CallIntent.CHECK_STATUS,
-    # Information tools
-    "get_business_hours": CallIntent.GET_HOURS,
-    "get_location": CallIntent.GET_LOCATION,
-    "list_services": CallIntent.GET_SERVICES,
-    # Booking tools
-    "check_availability": CallIntent.SCHEDULE_APPOINTMENT,
-    "propose_appointment": CallIntent.SCHEDULE_APPOINTMENT,
-    "confirm_appointment": CallIntent.SCHEDULE_APPOINTMENT,
-    # Transfer
-    "transfer_to_human": CallIntent.TRANSFER_HUMAN,
-}
+# (read-only so importers can share it without copying)
+TOOL_TO_INTENT_MAPPING: Mapping[str, CallIntent] = MappingProxyType(
+    {
+        # Status/introspection tools
+        "lookup_work_order": CallIntent.CHECK_STATUS,
+        "get_work_order_status": CallIntent.CHECK_STATUS,
+        "get_customer_vehicles": CallIntent.CHECK_STATUS,
+        # Information tools
+        "get_business_hours": CallIntent.GET_HOURS,
+        "get_location": CallIntent.GET_LOCATION,
+        "list_services": CallIntent.GET_SERVICES,
+        # Booking tools
+        "check_availability": CallIntent.SCHEDULE_APPOINTMENT,
+        "propose_appointment": CallIntent.SCHEDULE_APPOINTMENT,
+        "confirm_appointment": CallIntent.SCHEDULE_APPOINTMENT,
+        # Transfer
+        "transfer_to_human": CallIntent.TRANSFER_HUMAN,
+    }
+)
 
 
 def get_intent_for_tool(tool_name: str) -> CallIntent:
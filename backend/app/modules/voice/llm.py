@@ -8,6 +8,7 @@ import json
 import logging
 from typing import Any
 
+import orjson
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion, ChatCompletionMessage
 
@@ -70,7 +71,7 @@ class LLMClient:
         self,
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]],
-        tool_executor: Any,  # Callable that executes tools
+        tool_executor: Any,  # Callable that executes a turn's tool calls
         max_iterations: int = 5,
     ) -> tuple[str, list[dict[str, Any]]]:
         """Run a chat completion with automatic tool execution loop.
@@ -84,7 +85,8 @@ class LLMClient:
         Args:
             messages: Initial messages (including system prompt).
             tools: Tool definitions for function calling.
-            tool_executor: Async callable that takes (tool_name, args) and returns result.
+            tool_executor: Async callable that takes a list of (tool_name, args) pairs
+                and returns their results in the same order.
             max_iterations: Maximum tool call iterations to prevent infinite loops.
 
         Returns:
@@ -104,11 +106,10 @@ class LLMClient:
             # Process tool calls
             working_messages.append(self._message_to_dict(message))
 
-            for tool_call in message.tool_calls:
-                # Skip non-function tool calls (e.g., custom tools)
-                if tool_call.type != "function":
-                    continue
-
+            # Skip non-function tool calls (e.g., custom tools)
+            function_calls = [call for call in message.tool_calls if call.type == "function"]
+            calls: list[tuple[str, dict[str, Any]]] = []
+            for tool_call in function_calls:
                 tool_name = tool_call.function.name
                 try:
                     tool_args = json.loads(tool_call.function.arguments)
@@ -116,10 +117,14 @@ class LLMClient:
                     tool_args = {}
 
                 logger.info("Executing tool: %s with args: %s", tool_name, tool_args)
+                calls.append((tool_name, tool_args))
 
-                # Execute the tool
-                tool_result = await tool_executor(tool_name, tool_args)
+            # Execute this turn's tools together (independent ones concurrently)
+            tool_results = await tool_executor(calls)
 
+            for tool_call, (tool_name, tool_args), tool_result in zip(
+                function_calls, calls, tool_results, strict=True
+            ):
                 tool_calls_made.append(
                     {
                         "tool": tool_name,
@@ -133,7 +138,7 @@ class LLMClient:
                     {
                         "role": "tool",
                         "tool_call_id": tool_call.id,
-                        "content": json.dumps(tool_result),
+                        "content": orjson.dumps(tool_result).decode(),
                     }
                 )
 
@@ -0,0 +1,35 @@
+"""Voice pipeline models for state shared across API workers."""
+
+from datetime import datetime
+
+from beanie import Document, Indexed
+from pydantic import BaseModel, Field
+
+from app.common.utils import utc_now
+
+
+class CallSlotLease(BaseModel):
+    """One in-progress call holding a concurrent call slot."""
+
+    call_id: str = Field(..., description="Twilio CallSid holding the slot")
+    expires_at: datetime = Field(..., description="When the slot is reclaimed unless renewed")
+
+
+class ActiveCallCounter(Document):
+    """In-progress calls for a shop, shared by all workers.
+
+    Used by the "mongo" call slot backend so that concurrent call limits
+    hold when the API runs with more than one worker process. Each call holds
+    a lease that its worker renews; leases left behind by a crashed worker
+    expire instead of holding the slot forever.
+    """
+
+    shop_id: Indexed(str, unique=True) = Field(..., description="Shop ID")  # type: ignore[valid-type]
+    leases: list[CallSlotLease] = Field(default_factory=list)
+    updated_at: datetime = Field(default_factory=utc_now)
+
+    class Settings:
+        name = "active_call_counters"
+
+    def __str__(self) -> str:
+        return f"ActiveCallCounter({self.shop_id}, leases={len(self.leases)})"
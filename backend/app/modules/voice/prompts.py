@@ -1,5 +1,7 @@
 """System prompts for the voice receptionist AI."""
 
+from functools import lru_cache
+
 SYSTEM_PROMPT_TEMPLATE = """You are a friendly and professional AI receptionist for {shop_name}, an auto repair shop.
 
 Your job is to help callers with:
@@ -45,9 +47,12 @@ Do not:
 """
 
 
+@lru_cache(maxsize=1024)
 def get_system_prompt(shop_name: str) -> str:
     """Get the system prompt with shop name filled in.
 
+    Cached per shop name, so repeat calls to a shop skip the formatting.
+
     Args:
         shop_name: The name of the auto repair shop.
 
@@ -5,21 +5,26 @@ low-latency speech-to-speech conversations with native function calling.
 """
 
 import asyncio
-import base64
-import json
+import binascii
 import logging
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import StrEnum
 from typing import Any
 
+import orjson
 import websockets
 from websockets.asyncio.client import ClientConnection
 
 logger = logging.getLogger(__name__)
 
+# Audio appends are the bulk of upstream traffic. Base64 never needs JSON
+# escaping, so the envelope is concatenated rather than built and dumped.
+_AUDIO_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_AUDIO_APPEND_SUFFIX = '"}'
 
-class RealtimeEventType(str, Enum):
+
+class RealtimeEventType(StrEnum):
     """Event types from OpenAI Realtime API."""
 
     # Session events
@@ -122,14 +127,12 @@ class RealtimeClient:
 
         try:
             async for message in self._ws:
-                if isinstance(message, bytes):
-                    message = message.decode("utf-8")
-
+                # orjson parses str and bytes frames alike, no decode needed
                 try:
-                    data = json.loads(message)
+                    data = orjson.loads(message)
                     event = self._parse_event(data)
                     await self._event_queue.put(event)
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.error("Failed to parse message: %s", message[:100])
         except websockets.ConnectionClosed:
             logger.info("WebSocket connection closed")
@@ -150,6 +153,11 @@ class RealtimeClient:
             RealtimeEvent objects as they arrive.
         """
         while self._connected or not self._event_queue.empty():
+            # Drain ready events directly; wait_for wraps every get in a new Task
+            if not self._event_queue.empty():
+                yield self._event_queue.get_nowait()
+                continue
+
             try:
                 event = await asyncio.wait_for(
                     self._event_queue.get(),
@@ -170,7 +178,8 @@ class RealtimeClient:
         if not self._ws or not self._connected:
             raise ConnectionError("Not connected to Realtime API")
 
-        await self._ws.send(json.dumps(event))
+        # Decode so the event still goes out as a text frame
+        await self._ws.send(orjson.dumps(event).decode())
 
     async def configure_session(
         self,
@@ -220,24 +229,30 @@ class RealtimeClient:
         await self.send(session_config)
         logger.info("Session configured with %d tools", len(tools))
 
-    async def send_audio(self, audio_chunk: bytes) -> None:
+    async def send_audio(self, audio_chunk: bytes | bytearray) -> None:
         """Stream audio input to the API.
 
         Args:
             audio_chunk: Raw PCM audio bytes (16-bit, mono).
         """
-        if not self._connected:
-            raise ConnectionError("Not connected to Realtime API")
+        # Encode audio as base64 (binascii skips base64.b64encode's wrapper)
+        await self.send_audio_base64(
+            binascii.b2a_base64(audio_chunk, newline=False).decode("ascii")
+        )
 
-        # Encode audio as base64
-        audio_b64 = base64.b64encode(audio_chunk).decode("utf-8")
+    async def send_audio_base64(self, audio_b64: str) -> None:
+        """Stream already base64-encoded audio input to the API.
 
-        await self.send(
-            {
-                "type": "input_audio_buffer.append",
-                "audio": audio_b64,
-            }
-        )
+        Lets callers that already hold base64 audio forward it without a
+        decode/re-encode round trip.
+
+        Args:
+            audio_b64: Base64-encoded audio in the session's input format.
+        """
+        if not self._ws or not self._connected:
+            raise ConnectionError("Not connected to Realtime API")
+
+        await self._ws.send(_AUDIO_APPEND_PREFIX + audio_b64 + _AUDIO_APPEND_SUFFIX)
 
     async def commit_audio(self) -> None:
         """Commit the audio buffer to trigger processing."""
@@ -273,7 +288,7 @@ class RealtimeClient:
                 "item": {
                     "type": "function_call_output",
                     "call_id": call_id,
-                    "output": json.dumps(result),
+                    "output": orjson.dumps(result).decode(),
                 },
             }
         )
@@ -5,28 +5,29 @@ the Realtime API client with tool execution.
 """
 
 import asyncio
-import base64
-import json
+import binascii
 import logging
 import uuid
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import StrEnum
 from typing import Any
 
+import orjson
+
 from app.config import get_settings
 from app.modules.calendar.service import get_calendar_adapter
 from app.modules.shops.models import ShopConfig
 from app.modules.voice.booking_state import BookingState
 from app.modules.voice.prompts import get_system_prompt
 from app.modules.voice.realtime import RealtimeClient, RealtimeEventType
-from app.modules.voice.service import get_adapter_for_config
+from app.modules.voice.service import get_pooled_adapter
 from app.modules.voice.tools import ToolRegistry
 
 logger = logging.getLogger(__name__)
 
 
-class SessionState(str, Enum):
+class SessionState(StrEnum):
     """State of the voice session."""
 
     IDLE = "idle"
@@ -38,9 +39,9 @@ class SessionState(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionMetrics:
-    """Metrics for a voice session."""
+    """Metrics for a voice session (slotted: one per live call)."""
 
     session_id: str
     start_time: float = 0.0
@@ -93,7 +94,7 @@ class RealtimeSession:
             api_key=settings.openai_api_key,
             model=settings.realtime_model,
         )
-        adapter = get_adapter_for_config(shop_config)
+        adapter = get_pooled_adapter(shop_config)
 
         # Calendar integration
         calendar_adapter = get_calendar_adapter(shop_config)
@@ -161,7 +162,7 @@ class RealtimeSession:
             await self._set_state(SessionState.ERROR)
             raise
 
-    async def send_audio(self, audio_chunk: bytes) -> None:
+    async def send_audio(self, audio_chunk: bytes | bytearray) -> None:
         """Forward audio from caller to OpenAI.
 
         Args:
@@ -227,7 +228,7 @@ class RealtimeSession:
         elif event_type == RealtimeEventType.AUDIO_DELTA:
             await self._set_state(SessionState.SPEAKING)
             if self._on_audio_out and "delta" in data:
-                audio_bytes = base64.b64decode(data["delta"])
+                audio_bytes = binascii.a2b_base64(data["delta"])
                 self._metrics.total_audio_out_bytes += len(audio_bytes)
                 await self._on_audio_out(audio_bytes)
 
@@ -276,11 +277,15 @@ class RealtimeSession:
 
         logger.info("Function call: %s (call_id=%s)", function_name, call_id)
 
-        try:
-            arguments = json.loads(arguments_str)
-        except json.JSONDecodeError:
-            logger.error("Failed to parse function arguments: %s", arguments_str)
+        # Argument-less tools send "{}" (or nothing); skip the parser for those
+        if not arguments_str or arguments_str == "{}":
             arguments = {}
+        else:
+            try:
+                arguments = orjson.loads(arguments_str)
+            except orjson.JSONDecodeError:
+                logger.error("Failed to parse function arguments: %s", arguments_str)
+                arguments = {}
 
         # Execute the tool
         try:
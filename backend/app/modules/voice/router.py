@@ -1,5 +1,6 @@
 """Voice API endpoints for testing the conversation engine."""
 
+import asyncio
 import json
 import logging
 from typing import Any
@@ -21,6 +22,57 @@ from app.modules.voice.service import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Coalesce small client audio frames up to ~100ms of 16kHz 16-bit mono PCM
+# before forwarding, so tiny MediaRecorder chunks don't each cost a send.
+_AUDIO_FLUSH_BYTES = 3200
+
+# How long teardown waits for the writer to send frames queued before the end
+_WRITER_DRAIN_TIMEOUT = 2.0
+
+# Compact binary framing for voice_stream (opt-in with ?binary=1).
+# Every server->client binary frame starts with a 1-byte tag; the WebSocket
+# frame already delimits the payload, so no length prefix is needed.
+FRAME_AUDIO = 0x00
+FRAME_TRANSCRIPT = 0x01
+FRAME_STATE = 0x02
+FRAME_ERROR = 0x03
+
+_ROLE_CODES = {"user": 0, "assistant": 1}
+
+
+def encode_frame(tag: int, payload: bytes) -> bytes:
+    """Prefix a payload with its 1-byte frame tag."""
+    return bytes((tag,)) + payload
+
+
+def encode_transcript_frame(role: str, text: str) -> bytes:
+    """Encode a transcript as tag + role byte (0=user, 1=assistant) + UTF-8 text."""
+    return bytes((FRAME_TRANSCRIPT, _ROLE_CODES.get(role, 1))) + text.encode("utf-8")
+
+
+def coalesce_outbound(items: list[tuple[bool, Any]]) -> list[tuple[bool, Any]]:
+    """Merge runs of consecutive audio chunks, keeping event order intact.
+
+    Args:
+        items: Queued (is_audio, payload) pairs in send order.
+
+    Returns:
+        The same messages with each run of audio joined into one payload.
+    """
+    merged: list[tuple[bool, Any]] = []
+    run: list[bytes] = []
+    for is_audio, payload in items:
+        if is_audio:
+            run.append(payload)
+            continue
+        if run:
+            merged.append((True, b"".join(run)))
+            run = []
+        merged.append((False, payload))
+    if run:
+        merged.append((True, b"".join(run)))
+    return merged
+
 
 # ============================================
 # Request/Response Schemas
@@ -128,7 +180,9 @@ async def voice_health() -> dict[str, Any]:
 
 
 @router.websocket("/stream")
-async def voice_stream(websocket: WebSocket, shop_id: str | None = None) -> None:
+async def voice_stream(
+    websocket: WebSocket, shop_id: str | None = None, binary: bool = False
+) -> None:
     """WebSocket endpoint for real-time voice conversations.
 
     This endpoint uses the OpenAI Realtime API for low-latency
@@ -144,49 +198,80 @@ async def voice_stream(websocket: WebSocket, shop_id: str | None = None) -> None
     - Server: {"type": "transcript", "role": "user"|"assistant", "text": "..."}
     - Server: {"type": "state", "state": "listening"|"speaking"|...}
     - Server: {"type": "error", "message": "..."}
+
+    Binary mode (?binary=1): every server message is a binary frame whose
+    first byte is a tag, followed by the payload:
+    - 0x00 audio: raw PCM bytes
+    - 0x01 transcript: role byte (0=user, 1=assistant) + UTF-8 text
+    - 0x02 state: UTF-8 state name
+    - 0x03 error: UTF-8 error message
     """
     await websocket.accept()
     logger.info("WebSocket connection accepted for shop_id=%s", shop_id)
 
     session: RealtimeSession | None = None
+    writer_task: asyncio.Task[None] | None = None
+
+    # All client-bound messages go through one writer task, so audio that
+    # piles up while a send is in flight leaves as a single frame. None in
+    # the outbox tells the writer to finish once everything before it is sent.
+    outbox: asyncio.Queue[tuple[bool, Any] | None] = asyncio.Queue()
+
+    async def send_outbound() -> None:
+        """Drain the outbox, merging queued audio chunks into single sends."""
+        while True:
+            items: list[tuple[bool, Any]] = []
+            item = await outbox.get()
+            while item is not None:
+                items.append(item)
+                if outbox.empty():
+                    break
+                item = outbox.get_nowait()
+            done = item is None
+
+            for is_audio, payload in coalesce_outbound(items):
+                try:
+                    if is_audio:
+                        if binary:
+                            payload = encode_frame(FRAME_AUDIO, payload)
+                        await websocket.send_bytes(payload)
+                    elif isinstance(payload, bytes):
+                        await websocket.send_bytes(payload)
+                    else:
+                        await websocket.send_json(payload)
+                except Exception as e:
+                    # The socket is gone; every later send would fail too
+                    logger.error("Failed to send to client: %s", e)
+                    return
+
+            if done:
+                return
 
     try:
         # Get shop config if provided
         # TODO: Look up actual shop config from database
         shop_config = None  # Uses MockAdapter for now
 
+        writer_task = asyncio.create_task(send_outbound())
+
         # Callbacks for session events
         async def on_audio_out(audio_chunk: bytes) -> None:
             """Send audio back to the client."""
-            try:
-                await websocket.send_bytes(audio_chunk)
-            except Exception as e:
-                logger.error("Failed to send audio: %s", e)
+            outbox.put_nowait((True, audio_chunk))
 
         async def on_transcript(role: str, text: str) -> None:
             """Send transcript to the client."""
-            try:
-                await websocket.send_json(
-                    {
-                        "type": "transcript",
-                        "role": role,
-                        "text": text,
-                    }
-                )
-            except Exception as e:
-                logger.error("Failed to send transcript: %s", e)
+            if binary:
+                outbox.put_nowait((False, encode_transcript_frame(role, text)))
+            else:
+                outbox.put_nowait((False, {"type": "transcript", "role": role, "text": text}))
 
         async def on_state_change(state: SessionState) -> None:
             """Notify client of state changes."""
-            try:
-                await websocket.send_json(
-                    {
-                        "type": "state",
-                        "state": state.value,
-                    }
-                )
-            except Exception as e:
-                logger.error("Failed to send state: %s", e)
+            if binary:
+                outbox.put_nowait((False, encode_frame(FRAME_STATE, state.value.encode())))
+            else:
+                outbox.put_nowait((False, {"type": "state", "state": state.value}))
 
         # Create and start session
         session = RealtimeSession(
@@ -200,21 +285,33 @@ async def voice_stream(websocket: WebSocket, shop_id: str | None = None) -> None
         await session.start()
 
         # Main message loop
+        audio_buffer = bytearray()
         while True:
             try:
                 message = await websocket.receive()
 
-                if message.get("type") == "websocket.disconnect":
+                # Fast path: binary audio frames are the overwhelming majority
+                audio = message.get("bytes")
+                if audio is not None:
+                    audio_buffer += audio
+                    if len(audio_buffer) >= _AUDIO_FLUSH_BYTES:
+                        await session.send_audio(bytes(audio_buffer))
+                        audio_buffer.clear()
+                    continue
+
+                if message["type"] == "websocket.disconnect":
                     break
 
-                # Handle binary audio data
-                if "bytes" in message:
-                    await session.send_audio(message["bytes"])
+                # Flush pending audio so it stays ordered before control messages
+                if audio_buffer:
+                    await session.send_audio(bytes(audio_buffer))
+                    audio_buffer.clear()
 
                 # Handle JSON text messages
-                elif "text" in message:
+                text = message.get("text")
+                if text is not None:
                     try:
-                        data = json.loads(message["text"])
+                        data = json.loads(text)
                         msg_type = data.get("type")
 
                         if msg_type == "end":
@@ -229,7 +326,7 @@ async def voice_stream(websocket: WebSocket, shop_id: str | None = None) -> None
                             logger.warning("Unknown message type: %s", msg_type)
 
                     except json.JSONDecodeError:
-                        logger.warning("Invalid JSON message: %s", message["text"][:100])
+                        logger.warning("Invalid JSON message: %s", text[:100])
 
             except WebSocketDisconnect:
                 logger.info("WebSocket disconnected")
@@ -237,19 +334,34 @@ async def voice_stream(websocket: WebSocket, shop_id: str | None = None) -> None
 
     except Exception as e:
         logger.exception("Error in voice stream: %s", e)
-        try:
-            await websocket.send_json(
-                {
-                    "type": "error",
-                    "message": str(e),
-                }
-            )
-        except Exception:
-            pass
+        error: Any = (
+            encode_frame(FRAME_ERROR, str(e).encode("utf-8"))
+            if binary
+            else {"type": "error", "message": str(e)}
+        )
+        if writer_task and not writer_task.done():
+            # Queue behind pending frames rather than racing the writer's send
+            outbox.put_nowait((False, error))
+        else:
+            try:
+                if binary:
+                    await websocket.send_bytes(error)
+                else:
+                    await websocket.send_json(error)
+            except Exception:
+                pass
 
     finally:
-        # Clean up session
+        # Clean up session (stop() queues the final transcript/state frames)
         if session:
             unregister_session(session.session_id)
             await session.stop()
+        if writer_task:
+            outbox.put_nowait(None)
+            try:
+                await asyncio.wait_for(writer_task, timeout=_WRITER_DRAIN_TIMEOUT)
+            except TimeoutError:
+                logger.warning("Timed out sending final frames to client")
+            except Exception as e:
+                logger.error("Voice stream writer failed: %s", e)
         logger.info("Voice stream session ended")
@@ -6,18 +6,28 @@ a complete conversation with the voice receptionist.
 
 import logging
 import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 from app.adapters import get_shop_adapter
 from app.adapters.base import ShopSystemAdapter
+from app.modules.calls.models import CallIntent
 from app.modules.shops.models import ShopConfig
+from app.modules.voice.intents import TOOL_TO_INTENT_MAPPING
 from app.modules.voice.llm import LLMClient
 from app.modules.voice.prompts import get_system_prompt
 from app.modules.voice.tools import ToolRegistry
 
 logger = logging.getLogger(__name__)
 
+# Intent values per tool name, precomputed for per-turn analytics lookups
+_TOOL_INTENT_VALUES: Mapping[str, str] = MappingProxyType(
+    {tool: intent.value for tool, intent in TOOL_TO_INTENT_MAPPING.items()}
+)
+
 
 @dataclass
 class ConversationResult:
@@ -45,6 +55,43 @@ def get_adapter_for_config(config: ShopConfig | None) -> ShopSystemAdapter:
     return get_shop_adapter(config)
 
 
+# Adapters are stateless apart from read caches, so one instance per shop is
+# shared by every conversation for that shop. Each entry remembers the shop's
+# adapter_type and updated_at; a shop write bumps updated_at (adapter
+# credentials included), so the next conversation rebuilds the adapter.
+_adapter_pool: dict[str | None, tuple[tuple[str, object], ShopSystemAdapter]] = {}
+
+
+def get_pooled_adapter(config: ShopConfig | None) -> ShopSystemAdapter:
+    """Get the shared shop-system adapter for a shop config.
+
+    Args:
+        config: Shop configuration, or None for the demo/mock adapter.
+
+    Returns:
+        The adapter instance shared by all sessions of this shop.
+    """
+    if config is None:
+        key, version = None, ("", None)
+    else:
+        key = str(getattr(config, "id", None))
+        version = (str(config.adapter_type), getattr(config, "updated_at", None))
+
+    pooled = _adapter_pool.get(key)
+    if pooled is not None and pooled[0] == version:
+        return pooled[1]
+
+    adapter = get_adapter_for_config(config)
+    _adapter_pool[key] = (version, adapter)
+    return adapter
+
+
+@lru_cache
+def get_llm_client() -> LLMClient:
+    """Get the shared LLM client (one HTTP connection pool per process)."""
+    return LLMClient()
+
+
 class ConversationService:
     """Orchestrates LLM + Tools for a voice conversation."""
 
@@ -64,9 +111,9 @@ class ConversationService:
         self.conversation_id = conversation_id or str(uuid.uuid4())
 
         # Set up components
-        self.adapter = get_adapter_for_config(shop_config)
-        self.tools = ToolRegistry(self.adapter)
-        self.llm = LLMClient()
+        self.adapter = get_pooled_adapter(shop_config)
+        self.tools = ToolRegistry(self.adapter)  # Per-conversation: holds booking attempts
+        self.llm = get_llm_client()
 
         # Conversation state
         self.messages: list[dict[str, Any]] = [
@@ -82,7 +129,8 @@ class ConversationService:
         Returns:
             ConversationResult with response and metadata.
         """
-        logger.info("Processing message: %s", user_input[:100])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing message: %s", user_input[:100])
 
         # Add user message to history
         self.messages.append({"role": "user", "content": user_input})
@@ -91,7 +139,7 @@ class ConversationService:
         response_text, tools_used = await self.llm.chat_with_tool_loop(
             messages=self.messages,
             tools=self.tools.get_tools_schema(),
-            tool_executor=self.tools.execute,
+            tool_executor=self.tools.execute_batch,
         )
 
         # Add assistant response to history
@@ -125,10 +173,7 @@ class ConversationService:
 
     def _tool_to_intent(self, tool_name: str) -> str:
         """Map tool name to intent for logging/analytics."""
-        from app.modules.voice.intents import get_intent_for_tool
-
-        intent = get_intent_for_tool(tool_name)
-        return intent.value
+        return _TOOL_INTENT_VALUES.get(tool_name, CallIntent.UNKNOWN.value)
 
     def get_conversation_id(self) -> str:
         """Get the conversation ID for continuity."""
@@ -5,21 +5,25 @@ extending the base RealtimeSession with g711_ulaw audio format
 and Twilio Media Streams integration.
 """
 
-import base64
-import json
+import asyncio
+import binascii
 import logging
 import time
+from collections.abc import Mapping
 from typing import Any
+from xml.sax.saxutils import escape
 
+import orjson
 from fastapi import APIRouter, Request, Response, WebSocket, WebSocketDisconnect
 
 from app.config import get_settings
 from app.modules.billing.service import check_quota, get_concurrent_limit, increment_usage
 from app.modules.calls.models import CallIntent, CallLog, CallOutcome
+from app.modules.calls.service import save_call_log
 from app.modules.context.service import update_context_from_call, update_context_from_sms
 from app.modules.shops.models import ShopConfig
-from app.modules.shops.service import get_shop_config_by_id, get_shop_config_by_phone
-from app.modules.sms.service import SmsService
+from app.modules.shops.service import get_shop_config_by_id, get_shop_config_by_phone_cached
+from app.modules.sms.service import SmsService, get_twilio_client
 from app.modules.voice.call_queue import enqueue_call
 from app.modules.voice.concurrent_manager import acquire_call_slot
 from app.modules.voice.intents import TOOL_TO_INTENT_MAPPING
@@ -33,13 +37,105 @@ router = APIRouter()
 # Settings loaded once at module level
 _settings = get_settings()
 
+# Outbound audio is batched into one Twilio media message per interval (seconds)
+_OUTBOUND_FLUSH_INTERVAL = 0.02
+
+# Most outbound audio held while a send to Twilio is stalled (g711_ulaw at
+# 8 kHz: 8000 bytes = 1 s). Beyond this the oldest audio is dropped, so a stuck
+# connection costs a skip in playback rather than unbounded memory and delay.
+# Realtime deltas arrive faster than real time, so bursts larger than this are
+# normal while sends are completing and are never trimmed.
+_OUTBOUND_MAX_BYTES = 8000
+
+# How long a send must be in flight before the socket counts as stalled (seconds)
+_OUTBOUND_STALL_SECONDS = 0.5
+
+# Server VAD for phone audio. Barge-in is gated here: OpenAI only reports
+# speech_started once the caller's audio clears the threshold, so a higher
+# threshold filters out line noise before it can interrupt a response.
+_TURN_DETECTION: dict[str, Any] = {
+    "type": "server_vad",
+    "threshold": _settings.twilio_vad_threshold,
+    "prefix_padding_ms": 300,
+    "silence_duration_ms": 500,
+}
+
+# Inbound caller audio is sent to OpenAI in batches of this many bytes
+# (g711_ulaw at 8 kHz: 800 bytes = 100 ms = five Twilio frames)
+_INBOUND_BATCH_BYTES = 800
+
+
+def _b64encode(audio: bytes) -> str:
+    """Base64-encode an outbound audio frame for a Twilio media message.
+
+    Uses binascii directly to skip base64.b64encode's argument coercion.
+    """
+    return binascii.b2a_base64(audio, newline=False).decode("ascii")
+
+
+_MEDIA_EVENT_MARKER = '"event":"media"'
+_PAYLOAD_MARKER = '"payload":"'
+
+# Events the media-stream loop has no work for; they are dropped unparsed
+_IGNORED_EVENT_MARKERS = ('"event":"connected"', '"event":"mark"')
+
+
+def _extract_media_payload(raw: str) -> str | None:
+    """Pull the base64 payload out of a raw Twilio media message.
+
+    Media messages arrive ~50 times per second per call, so they are sliced
+    directly out of the WebSocket text instead of being fully JSON-parsed.
+
+    Args:
+        raw: Raw text of a Twilio Media Stream message.
+
+    Returns:
+        The base64 audio payload, or None if this is not a media message
+        (or doesn't look like one) and should go through orjson.loads.
+    """
+    if _MEDIA_EVENT_MARKER not in raw:
+        return None
+    start = raw.find(_PAYLOAD_MARKER)
+    if start < 0:
+        return None
+    start += len(_PAYLOAD_MARKER)
+    end = raw.find('"', start)
+    if end < 0:
+        return None
+    return raw[start:end]
+
+
+# Post-call work (call log, usage, SMS) runs after the WebSocket is released.
+# Strong references keep those tasks alive until they finish.
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+def _on_background_task_done(task: asyncio.Task[None]) -> None:
+    """Forget a finished post-call task and surface its failure, if any."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Post-call task failed: %s", task.exception())
+
+
+async def drain_background_tasks() -> None:
+    """Wait for in-flight post-call work (called on application shutdown)."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
 
 # =============================================================================
 # Intent Mapping
 # =============================================================================
 
 # Use centralized mapping from intents module for consistency
-FUNCTION_TO_INTENT: dict[str, CallIntent] = TOOL_TO_INTENT_MAPPING
+FUNCTION_TO_INTENT: Mapping[str, CallIntent] = TOOL_TO_INTENT_MAPPING
+
+# Event types TwilioRealtimeSession intercepts, as plain strings: every event
+# (mostly audio deltas) is compared against these, and a str constant skips
+# the enum member lookup on each comparison
+_SPEECH_STARTED = RealtimeEventType.SPEECH_STARTED.value
+_FUNCTION_CALL_ARGS_DONE = RealtimeEventType.FUNCTION_CALL_ARGS_DONE.value
+_RESPONSE_DONE = RealtimeEventType.RESPONSE_DONE.value
 
 
 # =============================================================================
@@ -75,10 +171,11 @@ class TwilioRealtimeSession(RealtimeSession):
             to_number: Called phone number (your Twilio number).
             shop_config: Optional shop configuration for tools.
         """
-        # Initialize base class with our callbacks
+        # Initialize base class with our callbacks. on_audio_out is attached
+        # once Twilio's stream SID is known (see the stream_sid setter), so
+        # audio deltas before then are skipped without being decoded.
         super().__init__(
             shop_config=shop_config,
-            on_audio_out=self._send_audio_to_twilio,
             on_transcript=self._record_transcript,
             session_id=call_sid,  # Use call_sid as session_id
             caller_phone=from_number,
@@ -89,16 +186,27 @@ class TwilioRealtimeSession(RealtimeSession):
         self.call_sid = call_sid
         self.from_number = from_number
         self.to_number = to_number
-        self.stream_sid: str | None = None
+        self._stream_sid: str | None = None
+        self._media_prefix = ""  # Constant head of outbound media JSON
+        self._clear_message = ""  # Barge-in clear message, fixed for the call
+
+        # Inbound audio batching (see handle_media_payload)
+        self._in_buffer = bytearray()
+
+        # Outbound audio batching (see _send_audio_to_twilio)
+        self._out_buffer = bytearray()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._send_started: float | None = None  # time.monotonic() of the in-flight send
 
         # Call tracking
-        self._start_time: float = 0.0
+        self._start_time_ns = 0  # time.monotonic_ns() at start; immune to clock changes
         self._should_transfer = False
         self._transfer_reason: str | None = None
         self._detected_intent: CallIntent = CallIntent.UNKNOWN
-        self._transcripts: list[dict[str, str]] = []
+        self._transcripts: list[tuple[str, str]] = []  # (role, text) per turn
         self._sms_sent = False  # Track if SMS has been sent to prevent duplicates
         self._call_logged = False  # Track if call has been logged to prevent duplicates
+        self._log_task: asyncio.Task[None] | None = None
 
     @property
     def shop_id(self) -> str | None:
@@ -107,6 +215,26 @@ class TwilioRealtimeSession(RealtimeSession):
             return str(self.shop_config.id)
         return None
 
+    @property
+    def stream_sid(self) -> str | None:
+        """Twilio stream SID, set from the stream's start event."""
+        return self._stream_sid
+
+    @stream_sid.setter
+    def stream_sid(self, value: str | None) -> None:
+        # Everything but the payload is constant for the call, so outbound
+        # media messages are built by concatenation instead of JSON encoding
+        self._stream_sid = value
+        self._media_prefix = (
+            '{"event":"media","streamSid":' + orjson.dumps(value).decode() + ',"media":{"payload":"'
+            if value
+            else ""
+        )
+        self._clear_message = (
+            orjson.dumps({"event": "clear", "streamSid": value}).decode() if value else ""
+        )
+        self._on_audio_out = self._send_audio_to_twilio if value else None
+
     # -------------------------------------------------------------------------
     # Overridden Methods
     # -------------------------------------------------------------------------
@@ -114,7 +242,7 @@ class TwilioRealtimeSession(RealtimeSession):
     async def start(self) -> None:
         """Start session with g711_ulaw format for Twilio compatibility."""
         logger.info("Starting Twilio session: call=%s shop=%s", self.call_sid, self.shop_name)
-        self._start_time = time.time()
+        self._start_time_ns = time.monotonic_ns()
 
         await self._set_state(SessionState.CONNECTING)
 
@@ -128,11 +256,10 @@ class TwilioRealtimeSession(RealtimeSession):
                 voice=_settings.realtime_voice,
                 input_audio_format="g711_ulaw",
                 output_audio_format="g711_ulaw",
+                turn_detection=_TURN_DETECTION,
             )
 
             # Start event processing (uses parent's _event_loop)
-            import asyncio
-
             self._event_task = asyncio.create_task(self._event_loop())
 
             await self._set_state(SessionState.LISTENING)
@@ -153,27 +280,32 @@ class TwilioRealtimeSession(RealtimeSession):
         data = event.data
 
         # On speech start, clear Twilio buffer for instant barge-in
-        if event_type == RealtimeEventType.SPEECH_STARTED:
+        if event_type == _SPEECH_STARTED:
             if self._state == SessionState.SPEAKING:
                 await self.client.cancel_response()
                 await self._clear_twilio_buffer()
 
         # Track function calls for intent detection and transfer
-        if event_type == RealtimeEventType.FUNCTION_CALL_ARGS_DONE:
-            function_name = data.get("name", "")
+        elif event_type == _FUNCTION_CALL_ARGS_DONE:
+            data_get = data.get
+            function_name = data_get("name", "")
             self._detected_intent = FUNCTION_TO_INTENT.get(function_name, CallIntent.UNKNOWN)
 
             # Check if this is a transfer request
             if function_name == "transfer_to_human":
                 self._should_transfer = True
-                try:
-                    args = json.loads(data.get("arguments", "{}"))
-                    self._transfer_reason = args.get("reason", "Customer requested transfer")
-                except json.JSONDecodeError:
-                    self._transfer_reason = "Customer requested transfer"
+                self._transfer_reason = "Customer requested transfer"
+                arguments = data_get("arguments")
+                if arguments and arguments != "{}":
+                    try:
+                        self._transfer_reason = orjson.loads(arguments).get(
+                            "reason", self._transfer_reason
+                        )
+                    except orjson.JSONDecodeError:
+                        pass
 
         # After response completes, check if we should transfer
-        if event_type == RealtimeEventType.RESPONSE_DONE:
+        elif event_type == _RESPONSE_DONE:
             response = data.get("response", {})
             if response.get("status") == "completed" and self._should_transfer:
                 await self._execute_transfer()
@@ -184,13 +316,22 @@ class TwilioRealtimeSession(RealtimeSession):
     async def stop(self) -> None:
         """Stop session and log the call."""
         # Calculate duration before stopping
-        duration = int(time.time() - self._start_time) if self._start_time else 0
+        duration = (
+            (time.monotonic_ns() - self._start_time_ns) // 1_000_000_000
+            if self._start_time_ns
+            else 0
+        )
 
         # Stop the base session
         await super().stop()
+        self._on_audio_out = None
+        self._drop_pending_audio()
 
-        # Log the call to database
-        await self._log_call(duration)
+        # Log the call in the background so teardown doesn't wait on Mongo/SMS
+        if self._log_task is None:
+            self._log_task = asyncio.create_task(self._log_call(duration))
+            _background_tasks.add(self._log_task)
+            self._log_task.add_done_callback(_on_background_task_done)
 
         logger.info(
             "Call %s ended: duration=%ds, audio_in=%d bytes, audio_out=%d bytes, tools=%d",
@@ -213,7 +354,16 @@ class TwilioRealtimeSession(RealtimeSession):
         """
         event = message.get("event")
 
-        if event == "connected":
+        # Media is ~50 messages/s per call, so it's checked first and indexed
+        # directly rather than through chained .get() calls with defaults
+        if event == "media":
+            try:
+                payload = message["media"]["payload"]
+            except KeyError:
+                return
+            await self.handle_media_payload(payload)
+
+        elif event == "connected":
             logger.debug("Twilio stream connected")
 
         elif event == "start":
@@ -226,57 +376,111 @@ class TwilioRealtimeSession(RealtimeSession):
                 # The call will continue but won't process audio
                 await self._set_state(SessionState.ERROR)
 
-        elif event == "media":
-            # Forward audio directly to OpenAI (mulaw -> mulaw, no conversion)
-            payload = message.get("media", {}).get("payload", "")
-            if payload and self.client.is_connected:
-                audio = base64.b64decode(payload)
-                await self.send_audio(audio)
-
         elif event == "stop":
             await self.stop()
 
         elif event == "mark":
             logger.debug("Mark: %s", message.get("mark", {}).get("name"))
 
+    async def handle_media_payload(self, payload: str) -> None:
+        """Forward a Twilio media payload to OpenAI.
+
+        Args:
+            payload: Base64-encoded g711_ulaw audio from a media message.
+        """
+        # Forward audio directly to OpenAI (mulaw -> mulaw, no conversion).
+        # Twilio's 160-byte frames carry base64 padding, so they are decoded
+        # and batched, then sent upstream as one append per batch.
+        if payload and self.client.is_connected:
+            self._in_buffer += binascii.a2b_base64(payload)
+            if len(self._in_buffer) >= _INBOUND_BATCH_BYTES:
+                # Hand the filled buffer off instead of copying it to bytes;
+                # the encoder accepts any bytes-like object.
+                audio, self._in_buffer = self._in_buffer, bytearray()
+                await self.send_audio(audio)
+
     # -------------------------------------------------------------------------
     # Twilio Audio Output
     # -------------------------------------------------------------------------
 
     async def _send_audio_to_twilio(self, audio: bytes) -> None:
-        """Send audio to Twilio (callback for on_audio_out)."""
-        if not self.stream_sid:
+        """Queue audio for Twilio (callback for on_audio_out).
+
+        The model emits many small deltas; they are batched so Twilio gets
+        one media message (one WebSocket frame) per flush interval. While a
+        send is stalled the batch is bounded by _OUTBOUND_MAX_BYTES, dropping
+        the oldest audio.
+
+        Only registered while stream_sid is set.
+        """
+        self._out_buffer += audio
+        excess = len(self._out_buffer) - _OUTBOUND_MAX_BYTES
+        if excess > 0 and self._send_stalled():
+            # g711_ulaw is one byte per sample, so any cut is sample-aligned
+            del self._out_buffer[:excess]
+            logger.debug("Twilio send backlog for call %s, dropped %d bytes", self.call_sid, excess)
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+
+    def _send_stalled(self) -> bool:
+        """Whether the in-flight send to Twilio has been blocked too long."""
+        started = self._send_started
+        return started is not None and time.monotonic() - started > _OUTBOUND_STALL_SECONDS
+
+    async def _flush_after_interval(self) -> None:
+        """Send batched audio every flush interval until the batch is empty.
+
+        This task is the only sender, so a slow send makes audio accumulate
+        (bounded) in the batch instead of starting overlapping sends.
+        """
+        try:
+            while self._out_buffer:
+                await asyncio.sleep(_OUTBOUND_FLUSH_INTERVAL)
+                await self._flush_audio_to_twilio()
+        finally:
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+
+    async def _flush_audio_to_twilio(self) -> None:
+        """Send all batched audio to Twilio as a single media message."""
+        if not self._out_buffer:
             return
 
+        audio = bytes(self._out_buffer)
+        self._out_buffer.clear()
+
+        self._send_started = time.monotonic()
         try:
-            await self.twilio_ws.send_json(
-                {
-                    "event": "media",
-                    "streamSid": self.stream_sid,
-                    "media": {"payload": base64.b64encode(audio).decode()},
-                }
-            )
+            await self.twilio_ws.send_text(self._media_prefix + _b64encode(audio) + '"}}')
         except Exception as e:
             logger.error("Failed to send audio to Twilio: %s", e)
+        finally:
+            self._send_started = None
+
+    def _drop_pending_audio(self) -> None:
+        """Discard batched audio that has not been sent yet."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._out_buffer.clear()
 
     async def _clear_twilio_buffer(self) -> None:
         """Clear Twilio's audio buffer (enables instant barge-in)."""
         if not self.stream_sid:
             return
 
+        # Audio still batched locally would otherwise play after the clear
+        self._drop_pending_audio()
+
         try:
-            await self.twilio_ws.send_json(
-                {
-                    "event": "clear",
-                    "streamSid": self.stream_sid,
-                }
-            )
+            await self.twilio_ws.send_text(self._clear_message)
         except Exception as e:
             logger.error("Failed to clear Twilio buffer: %s", e)
 
     async def _record_transcript(self, role: str, text: str) -> None:
         """Record transcript (callback for on_transcript)."""
-        self._transcripts.append({"role": role, "text": text})
+        self._transcripts.append((role, text))
 
     # -------------------------------------------------------------------------
     # Call Transfer
@@ -284,8 +488,6 @@ class TwilioRealtimeSession(RealtimeSession):
 
     async def _execute_transfer(self) -> None:
         """Transfer the call to a human operator."""
-        from twilio.rest import Client  # type: ignore[import-untyped]  # noqa: I001
-
         transfer_number = (
             self.shop_config.settings.transfer_number if self.shop_config else None
         ) or _settings.default_transfer_number
@@ -296,10 +498,17 @@ class TwilioRealtimeSession(RealtimeSession):
 
         logger.info("Transferring call %s to %s", self.call_sid, transfer_number)
 
+        client = get_twilio_client()
+        if client is None:
+            logger.error("Twilio credentials not configured, cannot transfer %s", self.call_sid)
+            return
+
         try:
-            client = Client(_settings.twilio_account_sid, _settings.twilio_auth_token)
-            client.calls(self.call_sid).update(
-                twiml=f"<Response><Say>Transferring you now.</Say><Dial>{transfer_number}</Dial></Response>"
+            # The Twilio SDK is synchronous; run the HTTPS round trip in a
+            # worker thread so other calls' audio keeps flowing meanwhile
+            await asyncio.to_thread(
+                client.calls(self.call_sid).update,
+                twiml=f"<Response><Say>Transferring you now.</Say><Dial>{transfer_number}</Dial></Response>",
             )
         except Exception as e:
             logger.exception("Transfer failed for call %s: %s", self.call_sid, e)
@@ -311,8 +520,11 @@ class TwilioRealtimeSession(RealtimeSession):
     async def _log_call(self, duration: int) -> None:
         """Save call record to database and increment usage.
 
-        This method is idempotent - it will not log the same call twice.
-        Uses both application-level flag and database unique index for protection.
+        Runs at most once per session (application-level flag), skips calls
+        already persisted, and relies on the call_sid unique index for the
+        rest. Once queued for the batched writer, logging is best-effort: a
+        failed insert is retried once and then dropped, and the find_one guard
+        cannot see logs still waiting in the queue.
         """
         # Check if already logged (application-level guard)
         if self._call_logged:
@@ -324,12 +536,15 @@ class TwilioRealtimeSession(RealtimeSession):
             logger.warning("Cannot log call without call_sid")
             return
 
+        tool_calls = self._metrics.tool_calls
+        last_tool_call = tool_calls[-1] if tool_calls else None
+
         # Determine outcome
         if self._should_transfer:
             outcome = CallOutcome.TRANSFERRED
         elif self._state == SessionState.ERROR:
             outcome = CallOutcome.FAILED
-        elif self._metrics.tool_calls:
+        elif last_tool_call:
             outcome = CallOutcome.RESOLVED
         else:
             outcome = CallOutcome.ABANDONED
@@ -365,24 +580,20 @@ class TwilioRealtimeSession(RealtimeSession):
                 duration_seconds=duration,
                 intent=self._detected_intent,
                 outcome=outcome,
-                tool_called=self._metrics.tool_calls[-1]["function"]
-                if self._metrics.tool_calls
-                else None,
-                tool_results=self._metrics.tool_calls[-1].get("result", {})
-                if self._metrics.tool_calls
-                else {},
+                tool_called=last_tool_call["function"] if last_tool_call else None,
+                tool_results=last_tool_call.get("result", {}) if last_tool_call else {},
                 transfer_reason=self._transfer_reason,
                 metadata={
                     "to_number": self.to_number,
-                    "tool_count": len(self._metrics.tool_calls),
+                    "tool_count": len(tool_calls),
                     "transcript_count": len(self._transcripts),
                     "booking_attempts": self.tools.get_booking_attempts()
                     if hasattr(self.tools, "get_booking_attempts")
                     else [],
                 },
             )
-            await call_log.insert()
-            self._call_logged = True  # Mark as logged after successful insert
+            await save_call_log(call_log)
+            self._call_logged = True  # Queued, not yet persisted; see docstring
             logger.info("Call logged: %s", self.call_sid)
 
             # Update customer context (async, non-blocking)
@@ -440,6 +651,52 @@ class TwilioRealtimeSession(RealtimeSession):
 # Twilio Webhook Endpoints
 # =============================================================================
 
+# TwiML connecting a call to the media stream. Its shape never changes, so it
+# is filled in directly instead of building a twilio.twiml element tree.
+_STREAM_TWIML = (
+    '<?xml version="1.0" encoding="UTF-8"?><Response>{say}<Connect><Stream url={ws_url}>'
+    '<Parameter name="callSid" value={call_sid} />'
+    '<Parameter name="fromNumber" value={from_number} />'
+    '<Parameter name="toNumber" value={to_number} />'
+    "{shop_param}</Stream></Connect></Response>"
+)
+_SAY_TWIML = '<Say voice="Polly.Joanna">{text}</Say>'
+_SHOP_PARAM_TWIML = '<Parameter name="shopId" value={shop_id} />'
+
+
+def _xml_attr(value: str) -> str:
+    """Quote and escape a value for use as an XML attribute."""
+    return '"' + escape(value, {'"': "&quot;"}) + '"'
+
+
+def _media_stream_response(
+    ws_url: str,
+    call_sid: str,
+    from_number: str,
+    to_number: str,
+    shop_id: str | None = None,
+    say: str | None = None,
+) -> Response:
+    """Generate TwiML response that connects the call to the media stream.
+
+    Args:
+        ws_url: WebSocket URL of the media stream endpoint.
+        call_sid: Twilio call SID, passed through to the stream.
+        from_number: Caller's phone number, passed through to the stream.
+        to_number: Called phone number, passed through to the stream.
+        shop_id: Shop already resolved for this call, if any.
+        say: Optional message to speak before connecting.
+    """
+    twiml = _STREAM_TWIML.format(
+        say=_SAY_TWIML.format(text=escape(say)) if say else "",
+        ws_url=_xml_attr(ws_url),
+        call_sid=_xml_attr(call_sid),
+        from_number=_xml_attr(from_number),
+        to_number=_xml_attr(to_number),
+        shop_param=_SHOP_PARAM_TWIML.format(shop_id=_xml_attr(shop_id)) if shop_id else "",
+    )
+    return Response(content=twiml, media_type="application/xml")
+
 
 def _quota_exceeded_transfer_response(transfer_number: str) -> Response:
     """Generate TwiML response to transfer call when quota is exceeded."""
@@ -494,8 +751,6 @@ async def handle_incoming_call(request: Request) -> Response:
     Returns TwiML instructing Twilio to open a bidirectional media stream.
     Checks quota before accepting the call.
     """
-    from twilio.twiml.voice_response import Connect, Stream, VoiceResponse  # type: ignore[import-untyped]  # noqa: I001
-
     form = await request.form()
     call_sid = form.get("CallSid", "unknown")
     from_number = form.get("From", "unknown")
@@ -510,7 +765,7 @@ async def handle_incoming_call(request: Request) -> Response:
         base_url = f"https://{host}"
 
     # Look up shop by phone number to check quota
-    shop_config = await get_shop_config_by_phone(str(to_number))
+    shop_config = await get_shop_config_by_phone_cached(str(to_number))
 
     if shop_config and shop_config.id:
         shop_id = str(shop_config.id)
@@ -567,7 +822,7 @@ async def handle_incoming_call(request: Request) -> Response:
             concurrent_limit = get_concurrent_limit(shop_id, subscription.plan_tier)
 
             # Try to acquire a concurrent call slot
-            slot_acquired = await acquire_call_slot(shop_id, concurrent_limit or 999)
+            slot_acquired = await acquire_call_slot(shop_id, concurrent_limit or 999, str(call_sid))
             if not slot_acquired:
                 # At concurrent limit - enqueue the call
                 logger.info(
@@ -599,17 +854,9 @@ async def handle_incoming_call(request: Request) -> Response:
 
     logger.info("Media stream URL: %s", ws_url)
 
-    # Generate TwiML
-    response = VoiceResponse()
-    connect = Connect()
-    stream = Stream(url=ws_url)
-    stream.parameter(name="callSid", value=str(call_sid))
-    stream.parameter(name="fromNumber", value=str(from_number))
-    stream.parameter(name="toNumber", value=str(to_number))
-    connect.append(stream)
-    response.append(connect)
-
-    return Response(content=str(response), media_type="application/xml")
+    return _media_stream_response(
+        ws_url, str(call_sid), str(from_number), str(to_number), shop_id=shop_id
+    )
 
 
 @router.websocket("/media-stream")
@@ -624,10 +871,26 @@ async def twilio_media_stream(websocket: WebSocket) -> None:
     session: TwilioRealtimeSession | None = None
     shop_id: str | None = None
     call_sid: str | None = None
+    slot_keepalive: asyncio.Task[None] | None = None
 
     try:
         while True:
-            message = json.loads(await websocket.receive_text())
+            # Twilio sends JSON as text frames, which the ASGI server hands over
+            # already decoded to str (receive_bytes/iter_bytes would raise on
+            # them). orjson parses the str in place, so nothing is re-encoded.
+            raw = await websocket.receive_text()
+
+            # Fast path for audio frames; only control events are JSON-parsed
+            if session and (payload := _extract_media_payload(raw)) is not None:
+                try:
+                    await session.handle_media_payload(payload)
+                except Exception as e:
+                    logger.exception("Error handling Twilio message: %s", e)
+                continue
+            if any(marker in raw for marker in _IGNORED_EVENT_MARKERS):
+                continue
+
+            message = orjson.loads(raw)
 
             # Create session on stream start
             if message.get("event") == "start" and session is None:
@@ -635,8 +898,18 @@ async def twilio_media_stream(websocket: WebSocket) -> None:
                 to_number = params.get("toNumber", "unknown")
                 call_sid = params.get("callSid", "unknown") or "unknown"
 
-                # Look up shop by Twilio phone number
-                shop_config = await get_shop_config_by_phone(to_number)
+                # The webhook passes the shop it resolved; fall back to the
+                # phone lookup for streams started without it
+                shop_config = None
+                if params.get("shopId"):
+                    try:
+                        shop_config = await get_shop_config_by_id(params["shopId"])
+                    except Exception as e:
+                        logger.warning(
+                            "Shop %s from stream params not found: %s", params["shopId"], e
+                        )
+                if shop_config is None:
+                    shop_config = await get_shop_config_by_phone_cached(to_number)
                 if shop_config:
                     logger.info("Matched shop: %s", shop_config.name)
                     shop_id = str(shop_config.id) if shop_config.id else None
@@ -648,12 +921,19 @@ async def twilio_media_stream(websocket: WebSocket) -> None:
                 # We don't acquire here to avoid double-acquisition
                 # Just log for monitoring
                 if shop_id:
-                    from app.modules.voice.concurrent_manager import get_concurrent_count
+                    from app.modules.voice.concurrent_manager import (
+                        get_concurrent_count,
+                        keep_call_slot_alive,
+                    )
 
                     logger.debug(
                         "WebSocket connecting for shop %s, current concurrent: %d",
                         shop_id,
-                        get_concurrent_count(shop_id),
+                        await get_concurrent_count(shop_id),
+                    )
+                    # Renew the slot's lease for as long as the stream is open
+                    slot_keepalive = asyncio.create_task(
+                        keep_call_slot_alive(shop_id, str(call_sid))
                     )
 
                 session = TwilioRealtimeSession(
@@ -682,10 +962,12 @@ async def twilio_media_stream(websocket: WebSocket) -> None:
             await session.stop()
 
         # Release semaphore slot when call ends
+        if slot_keepalive is not None:
+            slot_keepalive.cancel()
         if shop_id:
             from app.modules.voice.concurrent_manager import release_call_slot
 
-            release_call_slot(shop_id)
+            await release_call_slot(shop_id, str(call_sid))
             logger.debug("Released concurrent call slot for shop %s (call %s)", shop_id, call_sid)
 
 
@@ -695,7 +977,7 @@ async def handle_queue_handler(request: Request) -> Response:
 
     Called by Twilio repeatedly while caller is on hold.
     """
-    from twilio.twiml.voice_response import Connect, Stream, VoiceResponse  # type: ignore[import-untyped]  # noqa: I001
+    from twilio.twiml.voice_response import VoiceResponse  # type: ignore[import-untyped]  # noqa: I001
 
     form = await request.form()
     call_sid = form.get("CallSid", "unknown")
@@ -705,7 +987,7 @@ async def handle_queue_handler(request: Request) -> Response:
     logger.debug("Queue handler called for call %s", call_sid)
 
     # Look up shop
-    shop_config = await get_shop_config_by_phone(str(to_number))
+    shop_config = await get_shop_config_by_phone_cached(str(to_number))
     if not shop_config or not shop_config.id:
         # No shop found, reject
         response = VoiceResponse()
@@ -717,43 +999,19 @@ async def handle_queue_handler(request: Request) -> Response:
 
     shop_id = str(shop_config.id)
 
-    # Check if this call is in queue
-    from app.modules.voice.call_queue import get_queued_call
-
-    queued_call = get_queued_call(shop_id, str(call_sid))
-    if not queued_call:
-        # Not in queue, proceed normally
-        logger.warning("Call %s not found in queue, redirecting to media stream", call_sid)
-        base_url = _settings.twilio_webhook_base_url
-        if not base_url:
-            host = request.headers.get("host", "localhost:8000")
-            base_url = f"https://{host}"
-        ws_base = base_url.replace("https://", "wss://").replace("http://", "ws://")
-        ws_url = f"{ws_base}/api/twilio/media-stream"
-
-        response = VoiceResponse()
-        connect = Connect()
-        stream = Stream(url=ws_url)
-        stream.parameter(name="callSid", value=str(call_sid))
-        stream.parameter(name="fromNumber", value=str(from_number))
-        stream.parameter(name="toNumber", value=str(to_number))
-        connect.append(stream)
-        response.append(connect)
-        return Response(content=str(response), media_type="application/xml")
-
-    # Check if slot is available
     from app.modules.billing.service import get_concurrent_limit, get_or_create_subscription
+    from app.modules.voice.call_queue import enqueue_call, get_queued_call, remove_from_queue
     from app.modules.voice.concurrent_manager import acquire_call_slot
 
+    # Every caller reaching this handler is on hold, so it must win a slot
+    # before connecting - even when another worker enqueued it.
     subscription = await get_or_create_subscription(shop_id)
     concurrent_limit = get_concurrent_limit(shop_id, subscription.plan_tier)
 
     # Try to acquire slot
-    slot_acquired = await acquire_call_slot(shop_id, concurrent_limit or 999)
+    slot_acquired = await acquire_call_slot(shop_id, concurrent_limit or 999, str(call_sid))
     if slot_acquired:
         # Slot available! Remove from queue and redirect to media stream
-        from app.modules.voice.call_queue import remove_from_queue
-
         remove_from_queue(shop_id, str(call_sid))
 
         base_url = _settings.twilio_webhook_base_url
@@ -765,24 +1023,33 @@ async def handle_queue_handler(request: Request) -> Response:
 
         logger.info("Slot available for queued call %s, redirecting to media stream", call_sid)
 
-        response = VoiceResponse()
-        response.say("A representative is now available. Connecting you now.", voice="Polly.Joanna")
-        connect = Connect()
-        stream = Stream(url=ws_url)
-        stream.parameter(name="callSid", value=str(call_sid))
-        stream.parameter(name="fromNumber", value=str(from_number))
-        stream.parameter(name="toNumber", value=str(to_number))
-        connect.append(stream)
-        response.append(connect)
-        return Response(content=str(response), media_type="application/xml")
+        return _media_stream_response(
+            ws_url,
+            str(call_sid),
+            str(from_number),
+            str(to_number),
+            shop_id=shop_id,
+            say="A representative is now available. Connecting you now.",
+        )
+
+    queued_call = get_queued_call(shop_id, str(call_sid))
+    if not queued_call:
+        # The queue is per process: with several workers the poll can land on
+        # one that never enqueued this call. Adopt it here so it keeps holding
+        # (its hold timeout restarts on this worker).
+        logger.info("Call %s not found in this worker's queue, enqueuing here", call_sid)
+        await enqueue_call(
+            shop_id=shop_id,
+            call_sid=str(call_sid),
+            from_number=str(from_number),
+            to_number=str(to_number),
+        )
 
     # Still no slot available, continue holding
     # Check timeout (5 minutes max)
-    wait_time = time.time() - queued_call.queued_at
+    wait_time = time.time() - queued_call.queued_at if queued_call else 0.0
     if wait_time > 300:  # 5 minutes
         logger.warning("Call %s exceeded queue timeout, disconnecting", call_sid)
-        from app.modules.voice.call_queue import remove_from_queue
-
         remove_from_queue(shop_id, str(call_sid))
         response = VoiceResponse()
         response.say(
@@ -816,7 +1083,7 @@ async def handle_call_status(request: Request) -> Response:
         # Try to find and remove from queue
         try:
             to_number = form.get("To", "")
-            shop_config = await get_shop_config_by_phone(str(to_number))
+            shop_config = await get_shop_config_by_phone_cached(str(to_number))
             if shop_config and shop_config.id:
                 from app.modules.voice.call_queue import remove_from_queue
 
@@ -4,18 +4,32 @@ This module provides the interface between the LLM and the shop system adapters.
 Each tool maps to an adapter method that fetches data from the shop's system.
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime, time, timedelta
 from typing import Any
 
 from app.adapters.base import ShopSystemAdapter
-from app.adapters.calendar.base import CalendarAdapter
+from app.adapters.calendar.base import AppointmentData, CalendarAdapter
 from app.modules.calendar.service import validate_booking_permission
 from app.modules.shops.models import ShopConfig
-from app.modules.voice.booking_state import BookingState
+from app.modules.voice.booking_state import BookingAttempt, BookingState
 
 logger = logging.getLogger(__name__)
 
+# Booking attempts kept per registry (one registry per call). Older attempts
+# are dropped so a looping conversation can't grow the call log unbounded.
+_MAX_BOOKING_ATTEMPTS = 64
+
+_BOOKING_TOOL_NAMES = frozenset(
+    {"check_availability", "propose_appointment", "confirm_appointment"}
+)
+
+# Tools that change booking state; execute_batch runs them one at a time, in order
+_STATEFUL_TOOL_NAMES = frozenset({"propose_appointment", "confirm_appointment"})
+
 # OpenAI function calling schema for each tool
 TOOL_SCHEMAS: list[dict[str, Any]] = [
     {
@@ -217,6 +231,18 @@ TOOL_SCHEMAS: list[dict[str, Any]] = [
     },
 ]
 
+# Realtime API format of TOOL_SCHEMAS (flat, no nested "function" key).
+# Shop-independent, so it is built once instead of on every call setup.
+REALTIME_TOOL_SCHEMAS: list[dict[str, Any]] = [
+    {
+        "type": "function",
+        "name": tool["function"]["name"],
+        "description": tool["function"]["description"],
+        "parameters": tool["function"]["parameters"],
+    }
+    for tool in TOOL_SCHEMAS
+]
+
 
 class ToolRegistry:
     """MCP-style tool registry for LLM function calling.
@@ -250,7 +276,22 @@ class ToolRegistry:
         # Used as a safe default when creating appointments so the AI
         # doesn't need to ask for the phone number again.
         self.caller_phone = caller_phone
-        self._booking_attempts: list[dict[str, Any]] = []
+        self._booking_attempts: deque[BookingAttempt] = deque(maxlen=_MAX_BOOKING_ATTEMPTS)
+
+        # Tool name -> handler, so execute() dispatches with one dict lookup
+        self._handlers: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]] = {
+            "lookup_work_order": self._handle_lookup_work_order,
+            "get_work_order_status": self._handle_get_work_order_status,
+            "get_business_hours": self._handle_get_business_hours,
+            "get_location": self._handle_get_location,
+            "list_services": self._handle_list_services,
+            "get_customer_vehicles": self._handle_get_customer_vehicles,
+            "transfer_to_human": self._handle_transfer_to_human,
+            # Calendar booking tools
+            "check_availability": self._handle_check_availability,
+            "propose_appointment": self._handle_propose_appointment,
+            "confirm_appointment": self._handle_confirm_appointment,
+        }
 
     def get_tools_schema(self) -> list[dict[str, Any]]:
         """Get the OpenAI function calling schema for all tools.
@@ -268,15 +309,7 @@ class ToolRegistry:
         Returns:
             List of tool definitions in Realtime API format.
         """
-        return [
-            {
-                "type": "function",
-                "name": tool["function"]["name"],
-                "description": tool["function"]["description"],
-                "parameters": tool["function"]["parameters"],
-            }
-            for tool in TOOL_SCHEMAS
-        ]
+        return REALTIME_TOOL_SCHEMAS
 
     async def execute(self, tool_name: str, args: dict[str, Any]) -> dict[str, Any]:
         """Execute a tool call from the LLM.
@@ -288,8 +321,8 @@ class ToolRegistry:
         Returns:
             Result from the tool execution
         """
-        # Log booking tool calls at entry point
-        if tool_name in ["check_availability", "propose_appointment", "confirm_appointment"]:
+        # Log booking tool calls at entry point (args are filtered only if INFO is on)
+        if tool_name in _BOOKING_TOOL_NAMES and logger.isEnabledFor(logging.INFO):
             logger.info(
                 "🔧 TOOL EXECUTION: %s called - Args: %s, Shop: %s, Caller: %s",
                 tool_name,
@@ -298,84 +331,101 @@ class ToolRegistry:
                 self.caller_phone or "unknown",
             )
 
-        try:
-            if tool_name == "lookup_work_order":
-                results = await self.adapter.lookup_work_order(
-                    customer_name=args.get("customer_name"),
-                    license_plate=args.get("license_plate"),
-                    phone=args.get("phone"),
-                    last_name=args.get("last_name"),
-                )
-                if not results:
-                    return {
-                        "success": False,
-                        "message": "No work orders found matching the provided information.",
-                    }
-                return {"success": True, "work_orders": results}
-
-            elif tool_name == "get_work_order_status":
-                result = await self.adapter.get_work_order_status(args["order_id"])
-                return {"success": True, **result}
-
-            elif tool_name == "get_business_hours":
-                hours = await self.adapter.get_business_hours()
-                return {"success": True, "hours": hours}
-
-            elif tool_name == "get_location":
-                location = await self.adapter.get_location()
-                return {"success": True, "location": location}
-
-            elif tool_name == "list_services":
-                services = await self.adapter.list_services()
-                return {"success": True, "services": services}
-
-            elif tool_name == "get_customer_vehicles":
-                vehicles = await self.adapter.get_customer_vehicles(
-                    phone=args.get("phone"),
-                    customer_name=args.get("customer_name"),
-                )
-                if not vehicles:
-                    return {
-                        "success": False,
-                        "message": "No vehicles found for this customer.",
-                    }
-                return {"success": True, "vehicles": vehicles}
-
-            elif tool_name == "transfer_to_human":
-                # This is handled specially by the voice service
-                return {
-                    "success": True,
-                    "action": "transfer",
-                    "reason": args.get("reason", "Customer requested transfer"),
-                }
+        handler = self._handlers.get(tool_name)
+        if handler is None:
+            return {"success": False, "error": f"Unknown tool: {tool_name}"}
 
-            # Calendar booking tools
-            elif tool_name == "check_availability":
-                return await self._handle_check_availability(args)
+        try:
+            return await handler(args)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
 
-            elif tool_name == "propose_appointment":
-                return await self._handle_propose_appointment(args)
+    async def execute_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Execute the tool calls from one LLM turn.
 
-            elif tool_name == "confirm_appointment":
-                return await self._handle_confirm_appointment(args)
+        Read-only tools run concurrently, so the turn waits for the slowest
+        adapter call rather than the sum of them. Tools that change booking
+        state run afterwards, sequentially and in the order requested.
 
-            else:
-                return {"success": False, "error": f"Unknown tool: {tool_name}"}
+        Args:
+            calls: (tool_name, args) pairs in the order the LLM issued them.
 
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        Returns:
+            Tool results, in the same order as calls.
+        """
+        results: list[dict[str, Any]] = [{}] * len(calls)
+
+        reads = [i for i, (name, _) in enumerate(calls) if name not in _STATEFUL_TOOL_NAMES]
+        read_results = await asyncio.gather(*(self.execute(*calls[i]) for i in reads))
+        for i, result in zip(reads, read_results, strict=True):
+            results[i] = result
+
+        for i, (name, args) in enumerate(calls):
+            if name in _STATEFUL_TOOL_NAMES:
+                results[i] = await self.execute(name, args)
+
+        return results
+
+    async def _handle_lookup_work_order(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Handle lookup_work_order tool call."""
+        results = await self.adapter.lookup_work_order(
+            customer_name=args.get("customer_name"),
+            license_plate=args.get("license_plate"),
+            phone=args.get("phone"),
+            last_name=args.get("last_name"),
+        )
+        if not results:
+            return {
+                "success": False,
+                "message": "No work orders found matching the provided information.",
+            }
+        return {"success": True, "work_orders": results}
+
+    async def _handle_get_work_order_status(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Handle get_work_order_status tool call."""
+        result = await self.adapter.get_work_order_status(args["order_id"])
+        return {"success": True, **result}
+
+    async def _handle_get_business_hours(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Handle get_business_hours tool call."""
+        hours = await self.adapter.get_business_hours()
+        return {"success": True, "hours": hours}
+
+    async def _handle_get_location(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Handle get_location tool call."""
+        location = await self.adapter.get_location()
+        return {"success": True, "location": location}
+
+    async def _handle_list_services(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Handle list_services tool call."""
+        services = await self.adapter.list_services()
+        return {"success": True, "services": services}
+
+    async def _handle_get_customer_vehicles(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Handle get_customer_vehicles tool call."""
+        vehicles = await self.adapter.get_customer_vehicles(
+            phone=args.get("phone"),
+            customer_name=args.get("customer_name"),
+        )
+        if not vehicles:
+            return {
+                "success": False,
+                "message": "No vehicles found for this customer.",
+            }
+        return {"success": True, "vehicles": vehicles}
+
+    async def _handle_transfer_to_human(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Handle transfer_to_human tool call."""
+        # This is handled specially by the voice service
+        return {
+            "success": True,
+            "action": "transfer",
+            "reason": args.get("reason", "Customer requested transfer"),
+        }
 
     async def _handle_check_availability(self, args: dict[str, Any]) -> dict[str, Any]:
         """Handle check_availability tool call."""
-        from app.common.utils import utc_now
-
-        attempt = {
-            "tool_name": "check_availability",
-            "timestamp": utc_now().isoformat(),
-            "slot_proposed": None,
-            "confirmation_received": False,
-            "write_success": False,
-        }
+        attempt = BookingAttempt("check_availability")
 
         try:
             date_str = args.get("date")
@@ -390,43 +440,45 @@ class ToolRegistry:
             )
 
             if not self.calendar_adapter:
-                attempt["error"] = "Calendar integration not configured"
-                self._booking_attempts.append(attempt)
                 logger.warning(
                     "⚠️ BOOKING FAILED: Calendar integration not configured for shop %s",
                     self.shop_config.id if self.shop_config else "unknown",
                 )
-                return {
-                    "success": False,
-                    "message": "Appointment booking is not available. I can transfer you to speak with someone who can help schedule an appointment.",
-                }
+                return self._record_failure(
+                    attempt,
+                    "Calendar integration not configured",
+                    {
+                        "success": False,
+                        "message": "Appointment booking is not available. I can transfer you to speak with someone who can help schedule an appointment.",
+                    },
+                )
 
             if not date_str:
-                attempt["error"] = "Date not provided"
-                self._booking_attempts.append(attempt)
                 logger.warning("⚠️ BOOKING FAILED: Date not provided in check_availability request")
-                return {"success": False, "error": "Date is required"}
+                return self._record_failure(
+                    attempt, "Date not provided", {"success": False, "error": "Date is required"}
+                )
 
             # Parse date and create time range (check full day)
             try:
                 check_date = datetime.fromisoformat(date_str).date()
-                start = datetime.combine(check_date, datetime.min.time())
-                end = datetime.combine(check_date, datetime.max.time())
+                start = datetime.combine(check_date, time.min)
+                end = datetime.combine(check_date, time.max)
             except ValueError:
-                attempt["error"] = "Invalid date format"
-                self._booking_attempts.append(attempt)
                 logger.warning("⚠️ BOOKING FAILED: Invalid date format: %s", date_str)
-                return {
-                    "success": False,
-                    "error": "Invalid date format. Use ISO format (YYYY-MM-DD)",
-                }
+                return self._record_failure(
+                    attempt,
+                    "Invalid date format",
+                    {
+                        "success": False,
+                        "error": "Invalid date format. Use ISO format (YYYY-MM-DD)",
+                    },
+                )
 
-            # Check availability
+            # Check availability. A successful read isn't a booking attempt, so
+            # only failures are recorded (the call's tool metrics still log it)
             slots = await self.calendar_adapter.check_availability(start, end, duration_minutes)
 
-            attempt["write_success"] = True
-            self._booking_attempts.append(attempt)
-
             logger.info(
                 "✅ BOOKING SUCCESS: Found %d available slots on %s",
                 len(slots),
@@ -441,25 +493,18 @@ class ToolRegistry:
             }
 
         except Exception as e:
-            attempt["error"] = str(e)
-            self._booking_attempts.append(attempt)
             logger.exception(
                 "❌ BOOKING ERROR: Exception while checking availability - Date: %s, Error: %s",
                 args.get("date"),
                 str(e),
             )
-            return {"success": False, "error": f"Error checking availability: {e}"}
+            return self._record_failure(
+                attempt, str(e), {"success": False, "error": f"Error checking availability: {e}"}
+            )
 
     async def _handle_propose_appointment(self, args: dict[str, Any]) -> dict[str, Any]:
         """Handle propose_appointment tool call."""
-        from app.common.utils import utc_now
-
-        attempt = {
-            "tool_name": "propose_appointment",
-            "timestamp": utc_now().isoformat(),
-            "confirmation_received": False,
-            "write_success": False,
-        }
+        attempt = BookingAttempt("propose_appointment")
 
         try:
             date_str = args.get("date")
@@ -476,22 +521,26 @@ class ToolRegistry:
             )
 
             if not self.booking_state:
-                attempt["error"] = "Booking state not available"
-                self._booking_attempts.append(attempt)
                 logger.error("❌ BOOKING ERROR: Booking state not initialized")
-                return {"success": False, "error": "Booking state not initialized"}
+                return self._record_failure(
+                    attempt,
+                    "Booking state not available",
+                    {"success": False, "error": "Booking state not initialized"},
+                )
 
             if not date_str or not time_str:
-                attempt["error"] = "Date or time not provided"
-                self._booking_attempts.append(attempt)
                 logger.warning("⚠️ BOOKING FAILED: Date or time not provided in proposal")
-                return {"success": False, "error": "Date and time are required"}
+                return self._record_failure(
+                    attempt,
+                    "Date or time not provided",
+                    {"success": False, "error": "Date and time are required"},
+                )
 
             # Store proposal
             self.booking_state.propose(date_str, time_str, duration_minutes)
 
-            attempt["slot_proposed"] = f"{date_str} {time_str}"
-            attempt["write_success"] = True
+            attempt.slot_proposed = f"{date_str} {time_str}"
+            attempt.write_success = True
             self._booking_attempts.append(attempt)
 
             logger.info(
@@ -509,33 +558,25 @@ class ToolRegistry:
             }
 
         except Exception as e:
-            attempt["error"] = str(e)
-            self._booking_attempts.append(attempt)
             logger.exception(
                 "❌ BOOKING ERROR: Exception while proposing appointment - Date: %s, Time: %s, Error: %s",
                 args.get("date"),
                 args.get("time"),
                 str(e),
             )
-            return {"success": False, "error": f"Error proposing appointment: {e}"}
+            return self._record_failure(
+                attempt, str(e), {"success": False, "error": f"Error proposing appointment: {e}"}
+            )
 
     async def _handle_confirm_appointment(self, args: dict[str, Any]) -> dict[str, Any]:
         """Handle confirm_appointment tool call (write operation - guarded)."""
-        from app.adapters.calendar.base import AppointmentData
-        from app.common.utils import utc_now
-
-        attempt = {
-            "tool_name": "confirm_appointment",
-            "timestamp": utc_now().isoformat(),
-            "confirmation_received": False,
-            "write_success": False,
-        }
+        attempt = BookingAttempt("confirm_appointment")
 
         try:
             date_str = args.get("date")
             time_str = args.get("time")
             customer_name = args.get("customer_name")
-            phone = args.get("phone") or getattr(self, "caller_phone", None)
+            phone = args.get("phone") or self.caller_phone
 
             logger.info(
                 "🔒 BOOKING CONFIRMATION: Attempting to confirm appointment - Date: %s, Time: %s, Customer: %s, Phone: %s, Shop: %s",
@@ -548,88 +589,98 @@ class ToolRegistry:
 
             # Permission check: Only execute if booking is enabled
             if not self.shop_config or not validate_booking_permission(self.shop_config):
-                attempt["error"] = "Booking not enabled or not configured"
-                self._booking_attempts.append(attempt)
                 logger.warning(
                     "⚠️ BOOKING FAILED: Booking not enabled or not configured for shop %s",
                     self.shop_config.id if self.shop_config else "unknown",
                 )
-                return {
-                    "success": False,
-                    "message": "Appointment booking is not currently enabled. I can transfer you to speak with someone who can help schedule an appointment.",
-                }
+                return self._record_failure(
+                    attempt,
+                    "Booking not enabled or not configured",
+                    {
+                        "success": False,
+                        "message": "Appointment booking is not currently enabled. I can transfer you to speak with someone who can help schedule an appointment.",
+                    },
+                )
 
             # Calendar adapter check
             if not self.calendar_adapter:
-                attempt["error"] = "Calendar adapter not available"
-                self._booking_attempts.append(attempt)
                 logger.warning(
                     "⚠️ BOOKING FAILED: Calendar adapter not available for shop %s",
                     self.shop_config.id if self.shop_config else "unknown",
                 )
-                return {
-                    "success": False,
-                    "message": "Calendar integration is not configured. I can transfer you to speak with someone who can help schedule an appointment.",
-                }
+                return self._record_failure(
+                    attempt,
+                    "Calendar adapter not available",
+                    {
+                        "success": False,
+                        "message": "Calendar integration is not configured. I can transfer you to speak with someone who can help schedule an appointment.",
+                    },
+                )
 
             # Booking state check
             if not self.booking_state:
-                attempt["error"] = "Booking state not available"
-                self._booking_attempts.append(attempt)
                 logger.error("❌ BOOKING ERROR: Booking state not initialized")
-                return {"success": False, "error": "Booking state not initialized"}
+                return self._record_failure(
+                    attempt,
+                    "Booking state not available",
+                    {"success": False, "error": "Booking state not initialized"},
+                )
 
             if not date_str or not time_str:
-                attempt["error"] = "Date or time not provided"
-                self._booking_attempts.append(attempt)
                 logger.warning("⚠️ BOOKING FAILED: Date or time not provided in confirmation")
-                return {"success": False, "error": "Date and time are required"}
+                return self._record_failure(
+                    attempt,
+                    "Date or time not provided",
+                    {"success": False, "error": "Date and time are required"},
+                )
 
             # Verify confirmation: Check that this matches the proposed appointment
             if not self.booking_state.verify_confirmation(date_str, time_str):
-                attempt["error"] = "Confirmation mismatch - proposed appointment does not match"
-                self._booking_attempts.append(attempt)
                 logger.warning(
                     "⚠️ BOOKING FAILED: Confirmation mismatch - proposed: %s %s, confirmed: %s %s",
-                    self.booking_state.proposed_date if self.booking_state else "none",
-                    self.booking_state.proposed_time if self.booking_state else "none",
+                    self.booking_state.proposed_date or "none",
+                    self.booking_state.proposed_time or "none",
                     date_str,
                     time_str,
                 )
-                return {
-                    "success": False,
-                    "error": "The appointment details don't match what was proposed. Please propose the appointment first.",
-                }
+                return self._record_failure(
+                    attempt,
+                    "Confirmation mismatch - proposed appointment does not match",
+                    {
+                        "success": False,
+                        "error": "The appointment details don't match what was proposed. Please propose the appointment first.",
+                    },
+                )
 
             # Parse datetime
             try:
-                # Combine date and time
-                datetime_str = f"{date_str}T{time_str}"
-                if ":" not in time_str or time_str.count(":") == 1:
-                    # Add seconds if missing
-                    datetime_str = f"{date_str}T{time_str}:00"
-
-                start_time = datetime.fromisoformat(datetime_str)
+                # Combine date and time; fromisoformat (3.11+) accepts
+                # "HH", "HH:MM" and "HH:MM:SS", so no padding is needed
+                start_time = datetime.fromisoformat(f"{date_str}T{time_str}")
             except ValueError:
-                attempt["error"] = "Invalid date/time format"
-                self._booking_attempts.append(attempt)
                 logger.warning(
                     "⚠️ BOOKING FAILED: Invalid date/time format - Date: %s, Time: %s",
                     date_str,
                     time_str,
                 )
-                return {"success": False, "error": "Invalid date or time format"}
+                return self._record_failure(
+                    attempt,
+                    "Invalid date/time format",
+                    {"success": False, "error": "Invalid date or time format"},
+                )
+
+            calendar_settings = self.shop_config.settings.calendar_settings
 
             # Get duration from proposal or use default
             duration_minutes = (
                 self.booking_state.proposed_duration_minutes
-                or self.shop_config.settings.calendar_settings.default_duration_minutes
+                or calendar_settings.default_duration_minutes
             )
             end_time = start_time + timedelta(minutes=duration_minutes)
 
             # Create appointment
             appointment = AppointmentData(
-                calendar_id=self.shop_config.settings.calendar_settings.calendar_id,
+                calendar_id=calendar_settings.calendar_id,
                 start_time=start_time,
                 end_time=end_time,
                 summary="Customer appointment",
@@ -649,9 +700,9 @@ class ToolRegistry:
             result = await self.calendar_adapter.create_appointment(appointment)
 
             if result.get("success"):
-                attempt["confirmation_received"] = True
-                attempt["write_success"] = True
-                attempt["slot_proposed"] = f"{date_str} {time_str}"
+                attempt.confirmation_received = True
+                attempt.write_success = True
+                attempt.slot_proposed = f"{date_str} {time_str}"
                 self.booking_state.mark_confirmed()
                 appointment_id = result.get("appointment_id", "unknown")
                 logger.info(
@@ -662,8 +713,8 @@ class ToolRegistry:
                     customer_name or "unknown",
                 )
             else:
-                attempt["error"] = result.get("error", "Unknown error")
-                attempt["confirmation_received"] = True  # Customer did confirm, but write failed
+                attempt.error = result.get("error", "Unknown error")
+                attempt.confirmation_received = True  # Customer did confirm, but write failed
                 logger.error(
                     "❌ BOOKING FAILED: Failed to create appointment in calendar - Date: %s, Time: %s, Error: %s",
                     date_str,
@@ -676,16 +727,33 @@ class ToolRegistry:
             return result
 
         except Exception as e:
-            attempt["error"] = str(e)
-            self._booking_attempts.append(attempt)
             logger.exception(
                 "❌ BOOKING ERROR: Exception while confirming appointment - Date: %s, Time: %s, Error: %s",
                 args.get("date"),
                 args.get("time"),
                 str(e),
             )
-            return {"success": False, "error": f"Error confirming appointment: {e}"}
+            return self._record_failure(
+                attempt, str(e), {"success": False, "error": f"Error confirming appointment: {e}"}
+            )
+
+    def _record_failure(
+        self, attempt: BookingAttempt, error: str, response: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Record a failed booking attempt and pass its tool response through.
+
+        Args:
+            attempt: The attempt being recorded.
+            error: Reason stored in the call log.
+            response: Tool result returned to the LLM.
+
+        Returns:
+            The given response.
+        """
+        attempt.error = error
+        self._booking_attempts.append(attempt)
+        return response
 
     def get_booking_attempts(self) -> list[dict[str, Any]]:
-        """Get all booking attempts for logging."""
-        return self._booking_attempts.copy()
+        """Get the most recent booking attempts for logging."""
+        return [attempt.to_dict() for attempt in self._booking_attempts]
@@ -1,6 +1,11 @@
 """Shared test fixtures and configuration."""
 
+from collections.abc import Iterator
+
 import pytest
+from fastapi.testclient import TestClient
+
+from app.modules.shops.models import ShopConfig
 
 # Configure pytest-asyncio to use asyncio mode
 pytest_plugins = ["pytest_asyncio"]
@@ -10,3 +15,24 @@ pytest_plugins = ["pytest_asyncio"]
 def anyio_backend() -> str:
     """Use asyncio as the async backend."""
     return "asyncio"
+
+
+@pytest.fixture
+def shop_config() -> ShopConfig:
+    """A real shop config with default settings, using the mock adapter."""
+    # model_construct skips Beanie's collection check, so no database is needed
+    return ShopConfig.model_construct(id="shop123", name="Test Auto Shop", adapter_type="mock")
+
+
+@pytest.fixture(scope="session")
+def test_client() -> Iterator[TestClient]:
+    """HTTP client for the app, shared by the whole test session.
+
+    The lifespan is deliberately not entered (no ``with``), so tests never
+    touch the database; endpoints that need it must patch their lookups.
+    """
+    from app.main import app
+
+    client = TestClient(app)
+    yield client
+    client.close()
@@ -0,0 +1,18 @@
+"""Tests for audio format helpers."""
+
+import struct
+
+from app.modules.voice.audio import ulaw_to_pcm16
+
+
+class TestUlawToPcm16:
+    """Tests for mu-law to PCM conversion."""
+
+    def test_known_samples(self):
+        """Test silence and full-scale codes decode to G.711 reference values."""
+        pcm = ulaw_to_pcm16(bytes([0xFF, 0x7F, 0x00, 0x80]))
+        assert struct.unpack("<4h", pcm) == (0, 0, -32124, 32124)
+
+    def test_output_is_two_bytes_per_sample(self):
+        """Test a 20 ms Twilio frame becomes 320 bytes of PCM."""
+        assert len(ulaw_to_pcm16(bytes(160))) == 320
@@ -0,0 +1,91 @@
+"""Tests for call logging service."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.modules.calls import service
+from app.modules.calls.service import (
+    _insert_call_logs,
+    save_call_log,
+    start_call_log_writer,
+    stop_call_log_writer,
+)
+
+
+class TestCallLogWriter:
+    """Tests for the batched call log writer."""
+
+    @pytest.mark.asyncio
+    async def test_queued_logs_flushed_in_one_batch(self):
+        """Test logs saved while the writer runs go out in one insert_many."""
+        logs = [MagicMock() for _ in range(3)]
+
+        with patch(
+            "app.modules.calls.service.CallLog.insert_many", new_callable=AsyncMock
+        ) as mock_insert_many:
+            start_call_log_writer()
+            for log in logs:
+                await save_call_log(log)
+            await stop_call_log_writer()
+
+        mock_insert_many.assert_called_once_with(logs, ordered=False)
+        for log in logs:
+            log.insert.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_save_without_writer_inserts_directly(self):
+        """Test logs are inserted immediately when the writer isn't running."""
+        log = MagicMock()
+        log.insert = AsyncMock()
+
+        await save_call_log(log)
+
+        log.insert.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_retries_only_failed_logs(self, monkeypatch):
+        """Test a bulk failure retries the non-duplicate failures once."""
+        monkeypatch.setattr(service, "_CALL_LOG_RETRY_DELAY", 0)
+        logs = [MagicMock() for _ in range(3)]
+        error = BulkWriteError(
+            {
+                "writeErrors": [
+                    {"index": 0, "code": 11000, "errmsg": "duplicate key"},
+                    {"index": 2, "code": 91, "errmsg": "shutdown in progress"},
+                ]
+            }
+        )
+
+        with patch(
+            "app.modules.calls.service.CallLog.insert_many",
+            new_callable=AsyncMock,
+            side_effect=[error, None],
+        ) as mock_insert_many:
+            await _insert_call_logs(logs)
+
+        assert mock_insert_many.call_count == 2
+        mock_insert_many.assert_called_with([logs[2]], ordered=False)
+
+    @pytest.mark.asyncio
+    async def test_dead_writer_restarted_on_save(self):
+        """Test saving after the writer died restarts it instead of queueing forever."""
+        log = MagicMock()
+
+        with patch(
+            "app.modules.calls.service.CallLog.insert_many", new_callable=AsyncMock
+        ) as mock_insert_many:
+            start_call_log_writer()
+            dead = service._call_log_writer
+            assert dead is not None
+            dead.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await dead
+
+            await save_call_log(log)
+            assert service._call_log_writer is not dead
+            await stop_call_log_writer()
+
+        mock_insert_many.assert_called_once_with([log], ordered=False)
@@ -0,0 +1,86 @@
+"""Tests for the concurrent call manager."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.modules.voice import concurrent_manager
+from app.modules.voice.concurrent_manager import (
+    InMemoryCallSlotBackend,
+    MongoCallSlotBackend,
+    acquire_call_slot,
+    get_call_slot_backend,
+    get_concurrent_count,
+    release_call_slot,
+)
+
+
+class TestInMemoryBackend:
+    """Tests for the in-memory call slot backend."""
+
+    def test_same_shop_uses_same_stripe(self):
+        """A shop always maps to the same lock stripe."""
+        backend = InMemoryCallSlotBackend()
+        assert backend._lock_for("shop-a") is backend._lock_for("shop-a")
+
+    def test_lock_table_is_bounded(self):
+        """Lock table does not grow with the number of shops."""
+        backend = InMemoryCallSlotBackend()
+        locks = {id(backend._lock_for(f"shop-{i}")) for i in range(1000)}
+        assert len(locks) <= concurrent_manager._LOCK_STRIPES
+
+    def test_default_backend_is_in_memory(self):
+        """Without configuration, slots are tracked in-process."""
+        assert isinstance(get_call_slot_backend(), InMemoryCallSlotBackend)
+
+
+class TestCallSlots:
+    """Tests for acquiring and releasing call slots."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_until_limit(self):
+        """Slots are granted up to the limit, then refused."""
+        shop_id = "test-shop-limit"
+
+        assert await acquire_call_slot(shop_id, 2, "CA1") is True
+        assert await acquire_call_slot(shop_id, 2, "CA2") is True
+        assert await acquire_call_slot(shop_id, 2, "CA3") is False
+        assert await get_concurrent_count(shop_id) == 2
+
+        await release_call_slot(shop_id, "CA1")
+        assert await acquire_call_slot(shop_id, 2, "CA3") is True
+
+        # Cleanup
+        await release_call_slot(shop_id, "CA2")
+        await release_call_slot(shop_id, "CA3")
+        assert await get_concurrent_count(shop_id) == 0
+
+
+class TestMongoBackend:
+    """Tests for the MongoDB lease backend's admission logic."""
+
+    @staticmethod
+    def _patch_updates(monkeypatch, *results):
+        """Make each ActiveCallCounter update return/raise the next result."""
+        update = AsyncMock(side_effect=list(results))
+        counter = MagicMock()
+        counter.find_one.return_value.update = update
+        monkeypatch.setattr(concurrent_manager, "ActiveCallCounter", counter)
+        return update
+
+    @pytest.mark.asyncio
+    async def test_acquire_retries_upsert_race(self, monkeypatch):
+        """A duplicate key from a concurrent first upsert is retried, not refused."""
+        # Expired-lease pull, racing upsert, retried push
+        update = self._patch_updates(monkeypatch, None, DuplicateKeyError("dup"), None)
+
+        assert await MongoCallSlotBackend(90).acquire("shop-a", 2, "CA1") is True
+        assert update.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_acquire_refuses_full_shop(self, monkeypatch):
+        """A shop at its limit keeps colliding and the call is refused."""
+        self._patch_updates(monkeypatch, None, DuplicateKeyError("dup"), DuplicateKeyError("dup"))
+
+        assert await MongoCallSlotBackend(90).acquire("shop-a", 2, "CA1") is False
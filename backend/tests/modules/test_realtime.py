@@ -1,7 +1,9 @@
 """Tests for OpenAI Realtime API integration."""
 
 import asyncio
-from unittest.mock import MagicMock
+import base64
+import json
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -69,6 +71,31 @@ class TestRealtimeClient:
         with pytest.raises(ConnectionError):
             await client.send_audio(b"test audio")
 
+    @pytest.mark.asyncio
+    async def test_send_audio_base64_envelope(self):
+        """Test audio append is sent as a valid input_audio_buffer.append event."""
+        client = RealtimeClient(api_key="test-key")
+        client._ws = AsyncMock()
+        client._connected = True
+
+        await client.send_audio(b"test audio")
+
+        assert json.loads(client._ws.send.call_args[0][0]) == {
+            "type": "input_audio_buffer.append",
+            "audio": base64.b64encode(b"test audio").decode(),
+        }
+
+    @pytest.mark.asyncio
+    async def test_receive_drains_queued_events(self):
+        """Test queued events are yielded in order, even after disconnect."""
+        client = RealtimeClient(api_key="test-key")
+        for event_type in ("session.created", "response.done"):
+            await client._event_queue.put(client._parse_event({"type": event_type}))
+
+        received = [event.type async for event in client.receive()]
+
+        assert received == ["session.created", "response.done"]
+
 
 class TestRealtimeEventType:
     """Tests for RealtimeEventType enum."""
@@ -98,17 +125,9 @@ class TestRealtimeSession:
         assert session.shop_name == "Demo Auto Shop"
         assert session.state == SessionState.IDLE
 
-    def test_initialization_with_shop_config(self):
+    def test_initialization_with_shop_config(self, shop_config):
         """Test session with shop config."""
-        from app.modules.shops.models import ShopConfig, ShopSettings
-
-        config = MagicMock(spec=ShopConfig)
-        config.name = "Test Auto Shop"
-        config.adapter_type = "mock"
-        # Provide default settings so adapter/calendar resolution works
-        config.settings = ShopSettings()
-
-        session = RealtimeSession(shop_config=config)
+        session = RealtimeSession(shop_config=shop_config)
 
         assert session.shop_name == "Test Auto Shop"
 
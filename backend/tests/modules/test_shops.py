@@ -1,9 +1,19 @@
 """Tests for shop configuration service."""
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+from beanie import UpdateResponse
+
+from app.common.exceptions import NotFoundError
 from app.modules.shops.models import CalendarSettings, ShopConfig, ShopSettings
-from app.modules.shops.service import get_allowed_intents
+from app.modules.shops.schemas import ShopConfigUpdate
+from app.modules.shops.service import (
+    clear_shop_phone_cache,
+    get_allowed_intents,
+    get_shop_config_by_phone_cached,
+    update_shop_config,
+)
 
 
 class TestAllowedIntents:
@@ -47,3 +57,93 @@ class TestAllowedIntents:
         shop_config.settings = settings
         intents = get_allowed_intents(shop_config)
         assert "SCHEDULE_APPOINTMENT" not in intents
+
+
+class TestShopPhoneCache:
+    """Tests for the cached phone -> shop lookup used in call routing."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookup_hits_cache(self):
+        """Test a second lookup for the same number skips the database."""
+        shop_config = MagicMock(spec=ShopConfig)
+        clear_shop_phone_cache()
+
+        with patch(
+            "app.modules.shops.service.get_shop_config_by_phone", new_callable=AsyncMock
+        ) as mock_lookup:
+            mock_lookup.return_value = shop_config
+
+            assert await get_shop_config_by_phone_cached("+15551234567") is shop_config
+            assert await get_shop_config_by_phone_cached("+15551234567") is shop_config
+            mock_lookup.assert_called_once_with("+15551234567")
+
+            clear_shop_phone_cache()
+            await get_shop_config_by_phone_cached("+15551234567")
+            assert mock_lookup.call_count == 2
+
+        clear_shop_phone_cache()
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded_and_normalized(self, monkeypatch):
+        """Test formats of one number share an entry and old numbers are evicted."""
+        from app.modules.shops import service
+
+        monkeypatch.setattr(service, "_SHOP_BY_PHONE_MAXSIZE", 2)
+        clear_shop_phone_cache()
+
+        with patch(
+            "app.modules.shops.service.get_shop_config_by_phone", new_callable=AsyncMock
+        ) as mock_lookup:
+            mock_lookup.return_value = None
+
+            await get_shop_config_by_phone_cached("(555) 123-4567")
+            await get_shop_config_by_phone_cached("+15551234567")
+            assert mock_lookup.call_count == 1
+
+            await get_shop_config_by_phone_cached("+15550000001")
+            await get_shop_config_by_phone_cached("+15550000002")
+            assert list(service._shop_by_phone_cache) == ["+15550000001", "+15550000002"]
+
+        clear_shop_phone_cache()
+
+
+class TestUpdateShopConfig:
+    """Tests for updating a shop by ID."""
+
+    @pytest.mark.asyncio
+    async def test_malformed_id_is_not_found(self):
+        """Test an ID that isn't an ObjectId raises NotFoundError, not InvalidId."""
+        with pytest.raises(NotFoundError):
+            await update_shop_config("not-an-id", ShopConfigUpdate(name="New Name"))
+
+    @pytest.mark.asyncio
+    async def test_update_is_one_atomic_write(self, shop_config):
+        """Test fields and updated_at are written in one $set/$currentDate update."""
+        query = MagicMock()
+        query.update = AsyncMock(return_value=shop_config)
+
+        with patch(
+            "app.modules.shops.service.ShopConfig.find_one", return_value=query
+        ) as mock_find_one:
+            result = await update_shop_config(
+                "507f1f77bcf86cd799439011", ShopConfigUpdate(phone="(555) 123-4567")
+            )
+
+        assert result is shop_config
+        mock_find_one.assert_called_once()
+        query.update.assert_awaited_once_with(
+            {"$set": {"phone": "+15551234567"}, "$currentDate": {"updated_at": True}},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+
+    @pytest.mark.asyncio
+    async def test_missing_shop_is_not_found(self):
+        """Test updating a shop that no longer exists raises NotFoundError."""
+        query = MagicMock()
+        query.update = AsyncMock(return_value=None)
+
+        with (
+            patch("app.modules.shops.service.ShopConfig.find_one", return_value=query),
+            pytest.raises(NotFoundError),
+        ):
+            await update_shop_config("507f1f77bcf86cd799439011", ShopConfigUpdate(name="X"))
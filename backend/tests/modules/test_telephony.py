@@ -1,12 +1,21 @@
 """Tests for Twilio telephony integration."""
 
+import json
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from app.modules.calls.models import CallIntent
+from app.modules.voice import telephony
 from app.modules.voice.realtime_session import SessionState
-from app.modules.voice.telephony import FUNCTION_TO_INTENT, TwilioRealtimeSession
+from app.modules.voice.telephony import (
+    FUNCTION_TO_INTENT,
+    TwilioRealtimeSession,
+    _extract_media_payload,
+    drain_background_tasks,
+)
 
 
 class TestFunctionToIntentMapping:
@@ -52,24 +61,29 @@ class TestTwilioRealtimeSession:
         assert session.stream_sid is None
         assert session.shop_id is None
 
-    def test_initialization_with_shop_config(self):
-        """Test session with shop config."""
-        from app.modules.shops.models import ShopConfig, ShopSettings
+    def test_audio_out_attached_with_stream_sid(self):
+        """Test model audio is only routed to Twilio once the stream is known."""
+        session = TwilioRealtimeSession(
+            twilio_ws=MagicMock(),
+            call_sid="CA123",
+            from_number="+1",
+            to_number="+1",
+        )
+        assert session._on_audio_out is None
+
+        session.stream_sid = "MZ123"
+        assert session._on_audio_out == session._send_audio_to_twilio
 
+    def test_initialization_with_shop_config(self, shop_config):
+        """Test session with shop config."""
         mock_ws = MagicMock()
-        config = MagicMock(spec=ShopConfig)
-        config.name = "Test Auto Shop"
-        config.id = "shop123"
-        config.adapter_type = "mock"
-        # Provide default settings so adapter/calendar resolution works
-        config.settings = ShopSettings()
 
         session = TwilioRealtimeSession(
             twilio_ws=mock_ws,
             call_sid="CA123",
             from_number="+15551234567",
             to_number="+15559876543",
-            shop_config=config,
+            shop_config=shop_config,
         )
 
         assert session.shop_name == "Test Auto Shop"
@@ -80,23 +94,18 @@ class TestTwilioWebhooks:
     """Tests for Twilio webhook endpoints."""
 
     @pytest.mark.asyncio
-    async def test_incoming_call_returns_twiml(self):
+    async def test_incoming_call_returns_twiml(self, test_client):
         """Test incoming call webhook returns valid TwiML."""
-        from unittest.mock import AsyncMock, patch
-
-        from fastapi.testclient import TestClient
+        from unittest.mock import patch
 
-        from app.main import app
-
-        # Mock get_shop_config_by_phone to avoid database initialization
+        # Mock get_shop_config_by_phone_cached to avoid database initialization
         with patch(
-            "app.modules.voice.telephony.get_shop_config_by_phone", new_callable=AsyncMock
+            "app.modules.voice.telephony.get_shop_config_by_phone_cached",
+            new_callable=AsyncMock,
         ) as mock_get_shop:
             mock_get_shop.return_value = None  # No shop config found
 
-            client = TestClient(app)
-
-            response = client.post(
+            response = test_client.post(
                 "/api/twilio/incoming",
                 data={
                     "CallSid": "CA123",
@@ -108,20 +117,17 @@ class TestTwilioWebhooks:
             assert response.status_code == 200
             assert response.headers["content-type"] == "application/xml"
             assert "<Response>" in response.text
+            assert "/api/twilio/media-stream" in response.text
+            assert '<Parameter name="callSid" value="CA123" />' in response.text
+            assert '<Parameter name="fromNumber" value="+15551234567" />' in response.text
             assert "<Connect>" in response.text
             assert "<Stream" in response.text
             assert "callSid" in response.text
 
     @pytest.mark.asyncio
-    async def test_status_webhook(self):
+    async def test_status_webhook(self, test_client):
         """Test call status webhook."""
-        from fastapi.testclient import TestClient
-
-        from app.main import app
-
-        client = TestClient(app)
-
-        response = client.post(
+        response = test_client.post(
             "/api/twilio/status",
             data={
                 "CallSid": "CA123",
@@ -132,94 +138,200 @@ class TestTwilioWebhooks:
         assert response.status_code == 200
         assert response.text == "OK"
 
+    @pytest.mark.asyncio
+    async def test_queue_handler_holds_unknown_call_when_full(self, test_client, shop_config):
+        """A poll for a call another worker enqueued still needs a free slot."""
+        from unittest.mock import patch
+
+        with (
+            patch(
+                "app.modules.voice.telephony.get_shop_config_by_phone_cached",
+                new_callable=AsyncMock,
+                return_value=shop_config,
+            ),
+            patch(
+                "app.modules.billing.service.get_or_create_subscription",
+                new_callable=AsyncMock,
+                return_value=MagicMock(plan_tier="starter"),
+            ),
+            patch("app.modules.billing.service.get_concurrent_limit", return_value=1),
+            patch(
+                "app.modules.voice.concurrent_manager.acquire_call_slot",
+                new_callable=AsyncMock,
+                return_value=False,
+            ) as mock_acquire,
+            patch(
+                "app.modules.voice.call_queue.enqueue_call", new_callable=AsyncMock
+            ) as mock_enqueue,
+        ):
+            response = test_client.post(
+                "/api/twilio/queue-handler",
+                data={"CallSid": "CA999", "From": "+15551234567", "To": "+15559876543"},
+            )
+
+        assert response.status_code == 200
+        assert "<Connect>" not in response.text
+        assert "/api/twilio/queue-handler" in response.text
+        mock_acquire.assert_awaited_once_with("shop123", 1, "CA999")
+        mock_enqueue.assert_awaited_once()
+
 
 class TestTwilioMessageHandling:
     """Tests for Twilio message handling."""
 
-    @pytest.mark.asyncio
-    async def test_handle_connected_event(self):
-        """Test handling connected event."""
-        mock_ws = MagicMock()
-        session = TwilioRealtimeSession(
-            twilio_ws=mock_ws,
+    @pytest.fixture
+    def session(self) -> TwilioRealtimeSession:
+        """A fresh session on a mocked Twilio WebSocket."""
+        return TwilioRealtimeSession(
+            twilio_ws=AsyncMock(),
             call_sid="CA123",
             from_number="+1",
             to_number="+1",
         )
 
+    @pytest.mark.asyncio
+    async def test_handle_connected_event(self, session):
+        """Test handling connected event."""
         # Should not raise
         await session.handle_twilio_message({"event": "connected"})
 
     @pytest.mark.asyncio
-    async def test_handle_media_forwards_audio(self):
-        """Test media event forwards audio to OpenAI."""
+    async def test_handle_media_forwards_audio(self, session):
+        """Test media events are forwarded to OpenAI in 100 ms batches."""
         import base64
 
-        mock_ws = MagicMock()
-        session = TwilioRealtimeSession(
-            twilio_ws=mock_ws,
-            call_sid="CA123",
-            from_number="+1",
-            to_number="+1",
-        )
-
         # Mock client as connected (is_connected checks _connected AND _ws)
         session.client._connected = True
         session.client._ws = MagicMock()  # Mock WebSocket to pass is_connected check
         session.client.send_audio = AsyncMock()
 
-        audio_data = b"test audio"
-        payload = base64.b64encode(audio_data).decode()
+        frame = bytes(range(160))  # One 20 ms g711_ulaw frame
+        payload = base64.b64encode(frame).decode()
 
-        await session.handle_twilio_message(
-            {
-                "event": "media",
-                "media": {"payload": payload},
-            }
-        )
+        for _ in range(4):
+            await session.handle_twilio_message(
+                {
+                    "event": "media",
+                    "media": {"payload": payload},
+                }
+            )
+        session.client.send_audio.assert_not_called()
 
-        session.client.send_audio.assert_called_once()
+        await session.handle_twilio_message({"event": "media", "media": {"payload": payload}})
+
+        session.client.send_audio.assert_called_once_with(frame * 5)
+        assert session.metrics.total_audio_in_bytes == len(frame) * 5
+
+    def test_extract_media_payload(self):
+        """Test media payload is sliced from raw text; other events are not."""
+        raw = (
+            '{"event":"media","sequenceNumber":"3","media":{"track":"inbound",'
+            '"chunk":"1","timestamp":"5","payload":"YXVkaW8="},"streamSid":"MZ123"}'
+        )
+        assert _extract_media_payload(raw) == "YXVkaW8="
+        assert _extract_media_payload('{"event":"stop","streamSid":"MZ123"}') is None
 
     @pytest.mark.asyncio
-    async def test_send_audio_to_twilio(self):
+    async def test_send_audio_to_twilio(self, session):
         """Test audio is sent to Twilio in correct format."""
-        mock_ws = AsyncMock()
-        session = TwilioRealtimeSession(
-            twilio_ws=mock_ws,
-            call_sid="CA123",
-            from_number="+1",
-            to_number="+1",
-        )
+        mock_ws = session.twilio_ws
         session.stream_sid = "MZ123"
 
         await session._send_audio_to_twilio(b"audio")
+        await session._flush_audio_to_twilio()
 
-        mock_ws.send_json.assert_called_once()
-        call_args = mock_ws.send_json.call_args[0][0]
+        mock_ws.send_text.assert_called_once()
+        call_args = json.loads(mock_ws.send_text.call_args[0][0])
         assert call_args["event"] == "media"
         assert call_args["streamSid"] == "MZ123"
-        assert "payload" in call_args["media"]
+        assert call_args["media"]["payload"] == "YXVkaW8="
 
     @pytest.mark.asyncio
-    async def test_clear_twilio_buffer(self):
-        """Test barge-in clears Twilio buffer."""
-        mock_ws = AsyncMock()
-        session = TwilioRealtimeSession(
-            twilio_ws=mock_ws,
-            call_sid="CA123",
-            from_number="+1",
-            to_number="+1",
-        )
+    async def test_send_audio_batches_chunks(self, session):
+        """Test chunks within one flush interval go out as one media message."""
+        mock_ws = session.twilio_ws
+        session.stream_sid = "MZ123"
+
+        await session._send_audio_to_twilio(b"aud")
+        await session._send_audio_to_twilio(b"io")
+        mock_ws.send_text.assert_not_called()
+
+        assert session._flush_task is not None
+        await session._flush_task
+
+        mock_ws.send_text.assert_called_once()
+        assert json.loads(mock_ws.send_text.call_args[0][0])["media"]["payload"] == "YXVkaW8="
+
+    @pytest.mark.asyncio
+    async def test_send_audio_keeps_bursts_while_sends_complete(self, session):
+        """Test a burst over the cap is kept whole when no send is stalled."""
         session.stream_sid = "MZ123"
 
+        await session._send_audio_to_twilio(b"\x00" * 8000)
+        await session._send_audio_to_twilio(b"\xff" * 4000)
+
+        assert len(session._out_buffer) == 12000
+        session._drop_pending_audio()
+
+    @pytest.mark.asyncio
+    async def test_send_audio_drops_oldest_when_backlogged(self, session):
+        """Test the outbound batch is bounded while a send is stalled."""
+        session.stream_sid = "MZ123"
+        session._send_started = time.monotonic() - 5  # Send blocked for 5 s
+
+        await session._send_audio_to_twilio(b"\x00" * 8000)
+        await session._send_audio_to_twilio(b"\xff" * 160)
+
+        assert len(session._out_buffer) == 8000
+        assert session._out_buffer.endswith(b"\xff" * 160)
+        session._drop_pending_audio()
+
+    @pytest.mark.asyncio
+    async def test_stop_logs_call_in_background(self, session):
+        """Test stop() schedules call logging once without awaiting it."""
+        session.client.close = AsyncMock()
+        session._log_call = AsyncMock()
+
+        await session.stop()
+        await session.stop()
+        await drain_background_tasks()
+
+        session._log_call.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_clear_twilio_buffer(self, session):
+        """Test barge-in clears Twilio buffer and drops batched audio."""
+        mock_ws = session.twilio_ws
+        session.stream_sid = "MZ123"
+        await session._send_audio_to_twilio(b"audio")
+
         await session._clear_twilio_buffer()
+        assert session._flush_task is None
 
-        mock_ws.send_json.assert_called_once_with(
-            {
-                "event": "clear",
-                "streamSid": "MZ123",
-            }
+        mock_ws.send_text.assert_called_once()
+        assert json.loads(mock_ws.send_text.call_args[0][0]) == {
+            "event": "clear",
+            "streamSid": "MZ123",
+        }
+
+    @pytest.mark.asyncio
+    async def test_execute_transfer_runs_off_event_loop(self, session, monkeypatch):
+        """Test the blocking Twilio update runs in a worker thread."""
+        loop_thread = threading.get_ident()
+        update_threads: list[int] = []
+
+        client = MagicMock()
+        client.calls.return_value.update.side_effect = lambda **kwargs: update_threads.append(
+            threading.get_ident()
         )
+        monkeypatch.setattr(telephony, "get_twilio_client", lambda: client)
+        monkeypatch.setattr(telephony._settings, "default_transfer_number", "+15550000000")
+
+        await session._execute_transfer()
+
+        client.calls.assert_called_once_with("CA123")
+        assert "+15550000000" in client.calls.return_value.update.call_args.kwargs["twiml"]
+        assert update_threads and update_threads[0] != loop_thread
 
 
 # =============================================================================
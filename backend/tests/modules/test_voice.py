@@ -3,6 +3,13 @@
 import pytest
 
 from app.modules.voice.prompts import get_system_prompt
+from app.modules.voice.router import (
+    FRAME_STATE,
+    FRAME_TRANSCRIPT,
+    coalesce_outbound,
+    encode_frame,
+    encode_transcript_frame,
+)
 from app.modules.voice.service import (
     ConversationResult,
     ConversationService,
@@ -29,6 +36,30 @@ def test_conversation_service_initialization():
     assert service.messages[0]["role"] == "system"
 
 
+def test_conversations_share_llm_and_adapter():
+    """Test conversations for the same shop reuse pooled components."""
+    service1 = ConversationService()
+    service2 = ConversationService()
+
+    assert service1.llm is service2.llm
+    assert service1.adapter is service2.adapter
+    # Tool registry holds per-call booking state, so it is never shared
+    assert service1.tools is not service2.tools
+
+
+def test_pooled_adapter_rebuilt_after_shop_update(shop_config):
+    """Test a shop write (new updated_at) replaces the shop's pooled adapter."""
+    from datetime import timedelta
+
+    from app.modules.voice.service import get_pooled_adapter
+
+    adapter = get_pooled_adapter(shop_config)
+    assert get_pooled_adapter(shop_config) is adapter
+
+    shop_config.updated_at += timedelta(seconds=1)
+    assert get_pooled_adapter(shop_config) is not adapter
+
+
 def test_get_or_create_conversation_new():
     """Test creating a new conversation."""
     service = get_or_create_conversation()
@@ -78,6 +109,60 @@ def test_tool_to_intent_mapping():
     assert service._tool_to_intent("unknown_tool") == "UNKNOWN"
 
 
+def test_encode_transcript_frame():
+    """Test binary transcript framing: tag, role byte, UTF-8 text."""
+    frame = encode_transcript_frame("user", "héllo")
+
+    assert frame[0] == FRAME_TRANSCRIPT
+    assert frame[1] == 0
+    assert frame[2:].decode("utf-8") == "héllo"
+    assert encode_transcript_frame("assistant", "hi")[1] == 1
+
+
+def test_encode_state_frame():
+    """Test binary state framing."""
+    frame = encode_frame(FRAME_STATE, b"listening")
+
+    assert frame == bytes((FRAME_STATE,)) + b"listening"
+
+
+def test_coalesce_outbound_merges_audio_runs():
+    """Test consecutive audio chunks merge without reordering events."""
+    state = {"type": "state", "state": "listening"}
+    items = [(True, b"a"), (True, b"b"), (False, state), (True, b"c")]
+
+    assert coalesce_outbound(items) == [(True, b"ab"), (False, state), (True, b"c")]
+
+
+def test_voice_stream_sends_final_frames_on_end(test_client, monkeypatch):
+    """Test frames queued while the session stops still reach the client."""
+    import sys
+
+    from app.modules.voice.realtime_session import SessionState
+
+    # The voice package re-exports its APIRouter as `router`, shadowing the module
+    voice_router = sys.modules["app.modules.voice.router"]
+
+    class FakeSession:
+        session_id = "test-session"
+
+        def __init__(self, on_state_change, **kwargs):
+            self._on_state_change = on_state_change
+
+        async def start(self):
+            await self._on_state_change(SessionState.LISTENING)
+
+        async def stop(self):
+            await self._on_state_change(SessionState.ENDED)
+
+    monkeypatch.setattr(voice_router, "RealtimeSession", FakeSession)
+
+    with test_client.websocket_connect("/api/voice/stream") as ws:
+        assert ws.receive_json() == {"type": "state", "state": "listening"}
+        ws.send_json({"type": "end"})
+        assert ws.receive_json() == {"type": "state", "state": "ended"}
+
+
 # ============================================
 # Integration tests (require OpenAI API key)
 # ============================================
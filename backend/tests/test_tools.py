@@ -6,9 +6,12 @@ from app.adapters.mock.adapter import MockAdapter
 from app.modules.voice.tools import TOOL_SCHEMAS, ToolRegistry
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def tool_registry():
-    """Create a ToolRegistry with MockAdapter."""
+    """Create a ToolRegistry with MockAdapter, shared by this module.
+
+    None of these tests touch booking state, so one registry is enough.
+    """
     adapter = MockAdapter()
     return ToolRegistry(adapter)
 
@@ -17,12 +20,14 @@ def test_tool_schemas_defined():
     """Verify tool schemas are properly defined."""
     assert len(TOOL_SCHEMAS) >= 6
 
-    tool_names = [t["function"]["name"] for t in TOOL_SCHEMAS]
-    assert "lookup_work_order" in tool_names
-    assert "get_business_hours" in tool_names
-    assert "get_location" in tool_names
-    assert "list_services" in tool_names
-    assert "transfer_to_human" in tool_names
+    tool_names = {t["function"]["name"] for t in TOOL_SCHEMAS}
+    assert {
+        "lookup_work_order",
+        "get_business_hours",
+        "get_location",
+        "list_services",
+        "transfer_to_human",
+    } <= tool_names
 
 
 def test_get_tools_schema(tool_registry):
@@ -34,40 +39,21 @@ def test_get_tools_schema(tool_registry):
 
 
 @pytest.mark.asyncio
-async def test_execute_lookup_work_order(tool_registry):
-    """Test executing lookup_work_order tool."""
-    result = await tool_registry.execute("lookup_work_order", {"customer_name": "John Smith"})
-
-    assert result["success"] is True
-    assert "work_orders" in result
-    assert len(result["work_orders"]) >= 1
-
-
-@pytest.mark.asyncio
-async def test_execute_get_business_hours(tool_registry):
-    """Test executing get_business_hours tool."""
-    result = await tool_registry.execute("get_business_hours", {})
+@pytest.mark.parametrize(
+    ("tool_name", "args", "result_key"),
+    [
+        ("lookup_work_order", {"customer_name": "John Smith"}, "work_orders"),
+        ("get_business_hours", {}, "hours"),
+        ("get_location", {}, "location"),
+        ("list_services", {}, "services"),
+    ],
+)
+async def test_execute_read_tools(tool_registry, tool_name, args, result_key):
+    """Test read-only tools succeed and return their payload key."""
+    result = await tool_registry.execute(tool_name, args)
 
     assert result["success"] is True
-    assert "hours" in result
-
-
-@pytest.mark.asyncio
-async def test_execute_get_location(tool_registry):
-    """Test executing get_location tool."""
-    result = await tool_registry.execute("get_location", {})
-
-    assert result["success"] is True
-    assert "location" in result
-
-
-@pytest.mark.asyncio
-async def test_execute_list_services(tool_registry):
-    """Test executing list_services tool."""
-    result = await tool_registry.execute("list_services", {})
-
-    assert result["success"] is True
-    assert "services" in result
+    assert result[result_key]
 
 
 @pytest.mark.asyncio
@@ -86,3 +72,19 @@ async def test_execute_unknown_tool(tool_registry):
 
     assert result["success"] is False
     assert "error" in result
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_preserves_order(tool_registry):
+    """Test batched tool calls return results in request order."""
+    results = await tool_registry.execute_batch(
+        [
+            ("get_location", {}),
+            ("unknown_tool", {}),
+            ("get_business_hours", {}),
+        ]
+    )
+
+    assert "location" in results[0]
+    assert results[1]["success"] is False
+    assert "hours" in results[2]